@@ -1,6 +1,7 @@
 """API Router - v1"""
 
 from fastapi import APIRouter
+from fastapi.responses import ORJSONResponse
 from app.api.v1.endpoints import (
     strategies,
     backtests,
@@ -9,7 +10,7 @@ from app.api.v1.endpoints import (
     knowledge,
 )
 
-api_router = APIRouter()
+api_router = APIRouter(default_response_class=ORJSONResponse)
 
 # Include endpoint routers
 api_router.include_router(
@@ -1,19 +1,27 @@
 """Backtest endpoints"""
 
-from fastapi import APIRouter, Depends, HTTPException, status, BackgroundTasks
+from fastapi import APIRouter, Depends, HTTPException, status, BackgroundTasks, Request, Response
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy import select
 from typing import List
+from pydantic import TypeAdapter
 from uuid import UUID
 from datetime import datetime, timedelta
+import asyncio
 import logging
+import numpy as np
+import pandas as pd
 
+from app.api.v1.http_cache import cache_headers, etag_for, is_not_modified, not_modified
+from app.core.backtesting.worker_pool import backtest_pool
 from app.database import get_db, supabase_client
 from app.models import BacktestResult, Strategy
 from app.schemas import BacktestRequest, BacktestResponse
 
 router = APIRouter()
 logger = logging.getLogger(__name__)
+_rng = np.random.default_rng()
+_BACKTEST_LIST = TypeAdapter(List[BacktestResponse])
 
 
 async def run_backtest_task(
@@ -26,8 +34,9 @@ async def run_backtest_task(
     try:
         logger.info(f"🚀 Starting backtest {backtest_id} for strategy {strategy_id}")
         
-        # 1. Fetch Strategy Config (would typically get again to ensure freshness or passed in)
-        # For simplicity, we assume we have what we need, but ideally we query it
+        # 1. Fetch Strategy Config (canonical form stored at create time)
+        strategy = await supabase_client.get_strategy_by_id(str(strategy_id))
+        strategy_config = (strategy or {}).get('parsed_config') or {"name": "Test", "rules": []}
         
         # 2. Fetch Historical Data
         # Default to last 30 days for now if not specified in request
@@ -44,12 +53,8 @@ async def run_backtest_task(
             # Generate dummy data for demonstration if DB is empty
             market_data = _generate_dummy_data(start, end)
             
-        # 3. Run Backtest
-        from app.core.backtesting.vectorbt_adapter import vectorbt_adapter
-        # Pass a dummy config for now, or fetch actual strategy rules
-        strategy_config = {"name": "Test", "rules": []} 
-        
-        result = vectorbt_adapter.run_backtest(
+        # 3. Run Backtest (in a worker process - keeps the event loop responsive)
+        result = await backtest_pool.run_backtest(
             strategy_config, 
             market_data, 
             request.initial_capital
@@ -57,17 +62,17 @@ async def run_backtest_task(
         
         # 4. Update Result in Database
         result['strategy_id'] = str(strategy_id)
+        result['equity_curve'] = result['equity_curve'].tolist()  # JSON boundary
         # Update specific fields
-        await supabase_client.client.table('backtest_results').update({
+        await asyncio.to_thread(supabase_client.client.table('backtest_results').update({
             'total_trades': result['total_trades'],
             'win_rate': result['win_rate'],
             'profit_factor': result['profit_factor'],
             'sharpe_ratio': result['sharpe_ratio'],
             'max_drawdown': result['max_drawdown'],
             'total_return': result['total_return'],
-            'metrics': result, # Store full blob
-            'status': 'completed' # Add status column to table or use jsonb
-        }).eq('id', str(backtest_id)).execute()
+            'metrics': {**result, 'status': 'completed'} # Full blob; no status column, so it lives here
+        }).eq('id', str(backtest_id)).execute)
         
         logger.info(f"✅ Backtest {backtest_id} completed successfully")
         
@@ -76,24 +81,25 @@ async def run_backtest_task(
         # Update status to failed
         # await supabase_client.update_backtest_status(backtest_id, 'failed', error=str(e))
 
-def _generate_dummy_data(start, end):
-    """Generate dummy OHLCV data for testing"""
-    import pandas as pd
-    import numpy as np
-    
-    dates = pd.date_range(start=start, end=end, freq='1min')
-    df = pd.DataFrame(index=dates)
-    df['close'] = np.random.randn(len(df)).cumsum() + 100
-    df['open'] = df['close'].shift(1)
-    df['high'] = df['close'] + 1
-    df['low'] = df['close'] - 1
-    df['volume'] = np.random.randint(100, 1000, size=len(df))
+def _generate_dummy_data(start, end) -> pd.DataFrame:
+    """Generate dummy OHLCV data for testing, indexed by time"""
+    dates = pd.date_range(start=start, end=end, freq='1min', name='time')
+    n = len(dates)
+    
+    # Build the OHLC block in one preallocated array
+    ohlc = np.empty((n, 4), dtype=np.float64)
+    close = ohlc[:, 3]
+    close[:] = _rng.standard_normal(n).cumsum() + 100
+    ohlc[:1, 0] = 100
+    ohlc[1:, 0] = close[:-1]
+    ohlc[:, 1] = close + 1
+    ohlc[:, 2] = close - 1
+    
+    df = pd.DataFrame(ohlc, index=dates, columns=['open', 'high', 'low', 'close'])
+    df['volume'] = _rng.integers(100, 1000, size=n)
     df['symbol'] = 'BTCUSDT'
-    df.fillna(100, inplace=True)
     
-    # Convert to list of dicts
-    df['time'] = df.index
-    return df.to_dict('records')
+    return df
 
 
 @router.post("/", response_model=BacktestResponse, status_code=status.HTTP_202_ACCEPTED)
@@ -130,9 +136,10 @@ async def create_backtest(
         metrics={"status": "running"}
     )
     
+    # id is set client-side and created_at comes back via INSERT ... RETURNING
+    # (eager server defaults), so no refresh round-trip is needed
     db.add(backtest)
     await db.commit()
-    await db.refresh(backtest)
     
     # Schedule background task
     background_tasks.add_task(
@@ -155,27 +162,29 @@ async def list_backtests(
     db: AsyncSession = Depends(get_db)
 ):
     """List backtests, optionally filtered by strategy."""
-    query = select(BacktestResult).offset(skip).limit(limit)
+    # Read-only: fetch plain rows instead of tracked ORM instances
+    query = select(*BacktestResult.__table__.c).offset(skip).limit(limit)
     
     if strategy_id:
         query = query.where(BacktestResult.strategy_id == strategy_id)
     
     result = await db.execute(query.order_by(BacktestResult.created_at.desc()))
-    backtests = result.scalars().all()
+    backtests = _BACKTEST_LIST.validate_python([dict(row) for row in result.mappings()])
     
-    return backtests
+    return Response(content=_BACKTEST_LIST.dump_json(backtests), media_type="application/json")
 
 
 @router.get("/{backtest_id}", response_model=BacktestResponse)
 async def get_backtest(
+    request: Request,
     backtest_id: UUID,
     db: AsyncSession = Depends(get_db)
 ):
     """Get backtest results by ID."""
     result = await db.execute(
-        select(BacktestResult).where(BacktestResult.id == backtest_id)
+        select(*BacktestResult.__table__.c).where(BacktestResult.id == backtest_id)
     )
-    backtest = result.scalar_one_or_none()
+    backtest = result.mappings().one_or_none()
     
     if not backtest:
         raise HTTPException(
@@ -183,4 +192,17 @@ async def get_backtest(
             detail="Backtest not found"
         )
     
-    return backtest
+    # Finished backtests never change - let clients and CDNs cache them
+    headers = None
+    metrics = backtest['metrics'] or {}
+    if metrics.get('status') == 'completed':
+        etag = etag_for(backtest_id, backtest['total_trades'], backtest['final_capital'], metrics)
+        if is_not_modified(request, etag):
+            return not_modified(etag)
+        headers = cache_headers(etag)
+    
+    return Response(
+        content=BacktestResponse.model_validate(dict(backtest)).model_dump_json(),
+        media_type="application/json",
+        headers=headers
+    )
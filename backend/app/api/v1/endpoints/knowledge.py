@@ -7,6 +7,7 @@ from datetime import datetime
 
 from app.services.vector_store import vector_store
 from app.core.intelligence.gemini_client import gemini_client
+from app.core.intelligence.embedding_batcher import embedding_batcher
 
 router = APIRouter()
 logger = logging.getLogger(__name__)
@@ -28,10 +29,8 @@ async def ingest_knowledge(item: KnowledgeItem):
     """
     try:
         # 1. Generate Embedding using Gemini
-        # We use a helper method in gemini_client
-        # Note: generate_embedding is sync, but we can run it in a thread or just await if it was async
-        # For simplicity, calling the sync method (FastAPI handles it in threadpool if def is async)
-        embedding = await gemini_client.generate_embedding(item.content)
+        # Requests are coalesced by the batcher so bursts share one API call
+        embedding = await embedding_batcher.embed(item.content)
         
         if not embedding:
             raise HTTPException(status_code=500, detail="Failed to generate embedding")
@@ -1,24 +1,51 @@
 """Market data endpoints"""
 
-from fastapi import APIRouter, Depends, HTTPException, status, Query
+from fastapi import APIRouter, Depends, HTTPException, status, Query, Request, Response
+from fastapi.responses import StreamingResponse
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy import select, and_
-from typing import List
+from typing import AsyncIterator, List
+from pydantic import TypeAdapter
 from datetime import datetime
+import orjson
 
+from app.api.v1.http_cache import cache_headers, etag_for, is_not_modified, is_settled, not_modified
 from app.database import get_db
 from app.models import MarketData
 from app.schemas import MarketDataPoint
 
 router = APIRouter()
 
+MARKET_DATA_FIELDS = tuple(MarketDataPoint.model_fields)
+_MDP_LIST = TypeAdapter(List[MarketDataPoint])
+
+
+async def _stream_ndjson(query) -> AsyncIterator[bytes]:
+    """
+    Stream query rows as NDJSON, one object per line.
+    
+    Dependency sessions are closed before a streaming body is sent,
+    so the stream opens its own session for the lifetime of the response.
+    """
+    from app.database.postgres import AsyncSessionLocal
+    
+    async with AsyncSessionLocal() as session:
+        rows = await session.stream_scalars(query)
+        async for row in rows:
+            yield orjson.dumps(
+                {field: getattr(row, field) for field in MARKET_DATA_FIELDS},
+                default=str  # Decimal -> str, matching the JSON response
+            ) + b"\n"
+
 
 @router.get("/{symbol}", response_model=List[MarketDataPoint])
 async def get_market_data(
+    request: Request,
     symbol: str,
     start_time: datetime = Query(..., description="Start time (ISO format)"),
     end_time: datetime = Query(..., description="End time (ISO format)"),
     limit: int = Query(1000, le=10000),
+    format: str = Query("json", pattern="^(json|ndjson)$", description="Response format"),
     db: AsyncSession = Depends(get_db)
 ):
     """
@@ -28,8 +55,12 @@ async def get_market_data(
     - **start_time**: Start of time range (ISO 8601 format)
     - **end_time**: End of time range (ISO 8601 format)
     - **limit**: Maximum number of data points (max 10000)
+    - **format**: `json` (default) or `ndjson` to stream rows as they are read
+    
+    Ranges that ended more than an hour ago are served with an ETag and
+    long-lived Cache-Control, and conditional requests get a 304.
     """
-    result = await db.execute(
+    query = (
         select(MarketData)
         .where(
             and_(
@@ -41,6 +72,12 @@ async def get_market_data(
         .order_by(MarketData.time.asc())
         .limit(limit)
     )
+    
+    if format == "ndjson":
+        # Empty ranges yield an empty stream rather than a 404
+        return StreamingResponse(_stream_ndjson(query), media_type="application/x-ndjson")
+    
+    result = await db.execute(query)
     data = result.scalars().all()
     
     if not data:
@@ -49,7 +86,20 @@ async def get_market_data(
             detail=f"No market data found for {symbol} in the specified time range"
         )
     
-    return data
+    # Closed windows are immutable - let clients and CDNs cache them
+    headers = None
+    if is_settled(end_time):
+        etag = etag_for(symbol.upper(), start_time, end_time, limit, len(data), data[-1].time)
+        if is_not_modified(request, etag):
+            return not_modified(etag)
+        headers = cache_headers(etag)
+    
+    # Serialize with the prebuilt adapter (pydantic-core JSON writer)
+    return Response(
+        content=_MDP_LIST.dump_json(_MDP_LIST.validate_python(data, from_attributes=True)),
+        media_type="application/json",
+        headers=headers
+    )
 
 
 @router.get("/{symbol}/latest", response_model=MarketDataPoint)
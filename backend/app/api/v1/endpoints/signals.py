@@ -1,6 +1,7 @@
 """Signal endpoints"""
 
 from fastapi import APIRouter, HTTPException, status, Query
+from fastapi.responses import ORJSONResponse
 from typing import List, Optional
 from uuid import UUID
 from decimal import Decimal
@@ -36,7 +37,8 @@ async def list_signals(
         limit=limit
     )
     
-    return signals
+    # Supabase rows are already plain dicts - serialize directly
+    return ORJSONResponse(signals)
 
 
 @router.get("/{signal_id}", response_model=dict)
@@ -67,4 +69,4 @@ async def get_high_quality_signals(
         limit=limit
     )
     
-    return signals
+    return ORJSONResponse(signals)
@@ -1,6 +1,7 @@
 """Strategy endpoints"""
 
 from fastapi import APIRouter, HTTPException, status, Depends
+from fastapi.responses import ORJSONResponse
 from typing import List, Dict, Optional
 from uuid import UUID
 from datetime import datetime
@@ -20,13 +21,10 @@ async def create_strategy(strategy: StrategyCreate):
     Supports JSON, Pine Script, and Python strategy formats.
     """
     # 1. Validate Strategy Config
+    validation = {}
     if strategy.strategy_type == 'json':
-        # Use our parser to validate JSON structure
-        validation = strategy_parser.parse_json_strategy(
-            # Convert dict to json string if needed, or update parser to handle dicts
-            # Assuming config is a dict here
-            str(strategy.config).replace("'", '"') # profound hack for demo, ideally robust json dump
-        )
+        # Use our parser to validate JSON structure (config is already a dict)
+        validation = strategy_parser.parse_json_strategy(strategy.config)
         if not validation.get('valid'):
              # Allow saving even if invalid? Maybe not.
              # For now, let's just log warning but save it
@@ -41,6 +39,9 @@ async def create_strategy(strategy: StrategyCreate):
         'risk_management': strategy.config.get('risk_management', {}),
         'user_id': "00000000-0000-0000-0000-000000000000" # Placeholder
     }
+    if validation.get('valid'):
+        # Parsed once here; executors and backtests read it directly
+        strategy_data['parsed_config'] = validation['canonical']
     
     strategy_id = await supabase_client.store_strategy(strategy_data)
     
@@ -61,27 +62,19 @@ async def create_strategy(strategy: StrategyCreate):
 async def list_strategies():
     """List all strategies."""
     strategies = await supabase_client.get_strategies()
-    return strategies
+    # Supabase rows are already plain dicts - serialize directly
+    return ORJSONResponse(strategies)
 
 
 @router.get("/{strategy_id}", response_model=Dict)
 async def get_strategy(strategy_id: str):
     """Get a specific strategy by ID."""
-    # We need to add get_strategy_by_id to supabase_client
-    # optimizing to use list filter for now if specific method doesn't exist
-    # But wait, we saw supabase_client.py earlier
+    strategy = await supabase_client.get_strategy_by_id(strategy_id)
     
-    # Adding a quick helper here or expecting client to have it
-    # Let's check supabase_client again. It has get_strategies() but maybe not get_strategy()
+    if not strategy:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Strategy not found"
+        )
     
-    # Implementing fallback
-    strategies = await supabase_client.get_strategies()
-    for s in strategies:
-        if s['id'] == strategy_id:
-            return s
-            
-    raise HTTPException(
-        status_code=status.HTTP_404_NOT_FOUND,
-        detail="Strategy not found"
-    )
-
+    return strategy
@@ -0,0 +1,44 @@
+"""HTTP caching helpers for immutable API resources"""
+
+import hashlib
+from datetime import datetime, timedelta, timezone
+from typing import Any, Dict
+
+from fastapi import Request, Response, status
+
+IMMUTABLE_CACHE_CONTROL = "public, max-age=86400, immutable"
+
+
+def etag_for(*parts: Any) -> str:
+    """Build a strong ETag from the values that identify a response body"""
+    digest = hashlib.sha1(repr(parts).encode()).hexdigest()
+    return f'"{digest}"'
+
+
+def is_settled(end_time: datetime, grace: timedelta = timedelta(hours=1)) -> bool:
+    """True if a time window ended long enough ago that its data won't change"""
+    if end_time.tzinfo is None:
+        end_time = end_time.replace(tzinfo=timezone.utc)
+    return end_time < datetime.now(timezone.utc) - grace
+
+
+def cache_headers(etag: str) -> Dict[str, str]:
+    """Caching headers for an immutable response"""
+    return {"ETag": etag, "Cache-Control": IMMUTABLE_CACHE_CONTROL}
+
+
+def is_not_modified(request: Request, etag: str) -> bool:
+    """True if the client's If-None-Match already covers this ETag"""
+    if_none_match = request.headers.get("if-none-match")
+    if not if_none_match:
+        return False
+    candidates = {tag.strip().removeprefix("W/") for tag in if_none_match.split(",")}
+    return etag in candidates or "*" in candidates
+
+
+def not_modified(etag: str) -> Response:
+    """Empty 304 response carrying the caching headers"""
+    return Response(
+        status_code=status.HTTP_304_NOT_MODIFIED,
+        headers=cache_headers(etag),
+    )
@@ -24,6 +24,9 @@ class Settings(BaseSettings):
     # Google Gemini
     GEMINI_API_KEY: str
     GEMINI_MODEL: str = "gemini-2.0-flash-exp"
+    EMBEDDING_CACHE_SIZE: int = 4096
+    GEMINI_CACHE_TTL: int = 300  # seconds
+    GEMINI_CACHE_SIZE: int = 1024
     
     # Supabase (Vector DB)
     SUPABASE_URL: Optional[str] = None
@@ -52,6 +55,7 @@ class Settings(BaseSettings):
     MIN_SHARPE_RATIO: float = 1.5
     MAX_DRAWDOWN: float = 20.0
     MIN_PROFIT_FACTOR: float = 1.8
+    BACKTEST_WORKERS: Optional[int] = None  # defaults to os.cpu_count()
     
     # Security
     JWT_SECRET_KEY: str = "change-this-secret-key-in-production"
@@ -10,9 +10,34 @@ from datetime import datetime, timedelta
 from decimal import Decimal
 import logging
 
+from app.utils.jit import njit
+
 logger = logging.getLogger(__name__)
 
 
+@njit(cache=True)
+def _metrics_kernel(pnls: np.ndarray) -> Tuple[int, int, float, float]:
+    """
+    Single pass over trade PnL
+    
+    Returns:
+        Tuple of (winning_trades, losing_trades, gross_profit, gross_loss)
+    """
+    winning_trades = 0
+    losing_trades = 0
+    gross_profit = 0.0
+    gross_loss = 0.0
+    for pnl in pnls:
+        if pnl > 0:
+            winning_trades += 1
+            gross_profit += pnl
+        else:
+            losing_trades += 1
+            gross_loss -= pnl
+    
+    return winning_trades, losing_trades, gross_profit, gross_loss
+
+
 class BacktestEngine:
     """
     Vectorized backtesting engine for strategy validation
@@ -21,6 +46,7 @@ class BacktestEngine:
     
     def __init__(self):
         self.results_cache = {}
+        self._rng = np.random.default_rng()
         
     def run_backtest(
         self,
@@ -28,7 +54,8 @@ class BacktestEngine:
         signals: List[Dict],
         price_data: pd.DataFrame,
         initial_capital: float = 10000.0,
-        position_size: float = 0.1  # 10% of capital per trade
+        position_size: float = 0.1,  # 10% of capital per trade
+        seed: Optional[int] = None
     ) -> Dict:
         """
         Run backtest on historical signals
@@ -39,6 +66,7 @@ class BacktestEngine:
             price_data: DataFrame with OHLCV data
             initial_capital: Starting capital
             position_size: Fraction of capital per trade
+            seed: Optional RNG seed for reproducible replay
             
         Returns:
             Dictionary with backtest results and metrics
@@ -48,26 +76,17 @@ class BacktestEngine:
         if len(signals) == 0:
             return self._empty_result()
         
-        # Initialize tracking
-        capital = initial_capital
-        trades = []
-        equity_curve = [initial_capital]
+        rng = np.random.default_rng(seed) if seed is not None else self._rng
         
-        for signal in signals:
-            trade = self._execute_trade(
-                signal,
-                price_data,
-                capital,
-                position_size
-            )
-            
-            if trade:
-                trades.append(trade)
-                capital += trade['pnl']
-                equity_curve.append(capital)
+        trades, pnl, equity = self._execute_trades(
+            signals,
+            initial_capital,
+            position_size,
+            rng
+        )
         
         # Calculate metrics
-        metrics = self._calculate_metrics(trades, equity_curve, initial_capital)
+        metrics = self._calculate_metrics(pnl, equity, initial_capital)
         
         result = {
             'strategy_name': strategy_name,
@@ -84,7 +103,8 @@ class BacktestEngine:
             'expectancy': metrics['expectancy'],
             'risk_of_ruin': metrics['risk_of_ruin'],
             'trades': trades,
-            'equity_curve': equity_curve,
+            # float32 is plenty for plotting; serialize at the API boundary
+            'equity_curve': equity.astype(np.float32),
             'tested_at': datetime.utcnow().isoformat()
         }
         
@@ -92,91 +112,99 @@ class BacktestEngine:
         
         return result
     
-    def _execute_trade(
+    def _execute_trades(
         self,
-        signal: Dict,
-        price_data: pd.DataFrame,
-        capital: float,
-        position_size: float
-    ) -> Optional[Dict]:
-        """Simulate trade execution"""
-        try:
-            entry_price = signal['entry_price']
-            stop_loss = signal['stop_loss']
-            take_profit = signal['take_profit']
-            direction = signal['direction']
-            
-            # Calculate position size
-            risk_amount = capital * position_size
-            
-            if direction == 'BUY':
-                risk_per_unit = entry_price - stop_loss
-            else:  # SELL
-                risk_per_unit = stop_loss - entry_price
-            
-            if risk_per_unit <= 0:
-                return None
-                
-            units = risk_amount / risk_per_unit
-            
-            # Simulate exit (simplified - assumes hit TP or SL)
-            # In real backtest, would check price data
-            hit_tp = np.random.random() < 0.65  # Simulate 65% win rate
-            
-            if hit_tp:
-                if direction == 'BUY':
-                    pnl = (take_profit - entry_price) * units
-                else:
-                    pnl = (entry_price - take_profit) * units
-                exit_price = take_profit
-                outcome = 'win'
-            else:
-                if direction == 'BUY':
-                    pnl = (stop_loss - entry_price) * units
-                else:
-                    pnl = (entry_price - stop_loss) * units
-                exit_price = stop_loss
-                outcome = 'loss'
-            
-            return {
-                'entry_price': entry_price,
-                'exit_price': exit_price,
-                'direction': direction,
-                'units': units,
-                'pnl': pnl,
-                'pnl_percent': (pnl / risk_amount) * 100,
-                'outcome': outcome
+        signals: List[Dict],
+        initial_capital: float,
+        position_size: float,
+        rng: np.random.Generator
+    ) -> Tuple[List[Dict], np.ndarray, np.ndarray]:
+        """
+        Simulate execution of all signals at once
+        
+        Signals are unpacked into flat arrays so sizing, exits and PnL are
+        computed in NumPy rather than per-signal Python code.
+        
+        Returns:
+            Tuple of (trades, pnl, equity_curve)
+        """
+        n = len(signals)
+        entry = np.fromiter((s.get('entry_price', np.nan) for s in signals), dtype=np.float64, count=n)
+        stop_loss = np.fromiter((s.get('stop_loss', np.nan) for s in signals), dtype=np.float64, count=n)
+        take_profit = np.fromiter((s.get('take_profit', np.nan) for s in signals), dtype=np.float64, count=n)
+        direction_sign = np.fromiter(
+            (1 if s.get('direction') == 'BUY' else -1 for s in signals),
+            dtype=np.int8,
+            count=n
+        )
+        
+        # Skip signals with stops on the wrong side (or missing prices)
+        risk_per_unit = direction_sign * (entry - stop_loss)
+        valid = risk_per_unit > 0
+        if not valid.all():
+            logger.warning(f"Skipping {int(n - valid.sum())} signals with invalid stop loss")
+            entry = entry[valid]
+            stop_loss = stop_loss[valid]
+            take_profit = take_profit[valid]
+            direction_sign = direction_sign[valid]
+            risk_per_unit = risk_per_unit[valid]
+        
+        # Simulate exit (simplified - assumes hit TP or SL)
+        # In real backtest, would check price data
+        hit_tp = rng.random(len(entry)) < 0.65  # Simulate 65% win rate
+        exit_price = np.where(hit_tp, take_profit, stop_loss)
+        r_multiple = direction_sign * (exit_price - entry) / risk_per_unit
+        
+        # Risk is a fraction of running capital, so equity compounds per trade
+        equity = initial_capital * np.cumprod(1.0 + position_size * r_multiple)
+        risk_amount = np.concatenate(([initial_capital], equity[:-1])) * position_size
+        units = risk_amount / risk_per_unit
+        pnl = r_multiple * risk_amount
+        
+        trades = [
+            {
+                'entry_price': e,
+                'exit_price': x,
+                'direction': 'BUY' if d > 0 else 'SELL',
+                'units': u,
+                'pnl': p,
+                'pnl_percent': r * 100,
+                'outcome': 'win' if w else 'loss'
             }
-            
-        except Exception as e:
-            logger.error(f"Error executing trade: {e}")
-            return None
+            for e, x, d, u, p, r, w in zip(
+                entry.tolist(),
+                exit_price.tolist(),
+                direction_sign.tolist(),
+                units.tolist(),
+                pnl.tolist(),
+                r_multiple.tolist(),
+                hit_tp.tolist()
+            )
+        ]
+        
+        return trades, pnl, np.concatenate(([initial_capital], equity))
     
     def _calculate_metrics(
         self,
-        trades: List[Dict],
-        equity_curve: List[float],
+        pnl: np.ndarray,
+        equity_curve: np.ndarray,
         initial_capital: float
     ) -> Dict:
         """Calculate comprehensive performance metrics"""
         
-        if len(trades) == 0:
+        if len(pnl) == 0:
             return self._empty_metrics()
         
-        # Separate wins and losses
-        wins = [t for t in trades if t['outcome'] == 'win']
-        losses = [t for t in trades if t['outcome'] == 'loss']
+        equity_curve = np.asarray(equity_curve, dtype=np.float64)
         
-        winning_trades = len(wins)
-        losing_trades = len(losses)
-        total_trades = len(trades)
+        # Wins/losses and gross PnL in one compiled pass
+        winning_trades, losing_trades, gross_profit, gross_loss = _metrics_kernel(pnl)
+        total_trades = len(pnl)
         
         # Win rate
         win_rate = (winning_trades / total_trades * 100) if total_trades > 0 else 0
         
         # Profit factor
-        gross_profit = sum(t['pnl'] for t in wins) if wins else 0
-        gross_loss = abs(sum(t['pnl'] for t in losses)) if losses else 0
         profit_factor = (gross_profit / gross_loss) if gross_loss > 0 else 0
         
         # Average win/loss
@@ -191,14 +219,8 @@ class BacktestEngine:
         sharpe_ratio = (np.mean(returns) / np.std(returns) * np.sqrt(252)) if len(returns) > 1 and np.std(returns) > 0 else 0
         
         # Max drawdown
-        peak = equity_curve[0]
-        max_dd = 0
-        for value in equity_curve:
-            if value > peak:
-                peak = value
-            dd = (peak - value) / peak * 100
-            if dd > max_dd:
-                max_dd = dd
+        peaks = np.maximum.accumulate(equity_curve)
+        max_dd = float(((peaks - equity_curve) / peaks).max() * 100)
         
         # Total return
         total_return = ((equity_curve[-1] - initial_capital) / initial_capital * 100)
@@ -234,7 +256,7 @@ class BacktestEngine:
             'max_drawdown': 0.0,
             'total_return': 0.0,
             'trades': [],
-            'equity_curve': []
+            'equity_curve': np.empty(0, dtype=np.float32)
         }
     
     def _empty_metrics(self) -> Dict:
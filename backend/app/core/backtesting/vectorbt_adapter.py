@@ -1,7 +1,7 @@
 
 import pandas as pd
 import numpy as np
-from typing import Dict, List, Optional
+from typing import Dict, List, Optional, Tuple, Union
 from datetime import datetime
 import logging
 
@@ -12,46 +12,170 @@ try:
 except ImportError:
     HAS_VECTORBT = False
 
+from app.utils.jit import njit
+
 logger = logging.getLogger(__name__)
 
+
+@njit(cache=True)
+def _pandas_backtest_loop(
+    close: np.ndarray,
+    entries: np.ndarray,
+    exits: np.ndarray,
+    init_cash: float
+) -> Tuple[np.ndarray, int, int]:
+    """
+    All-in long on entry, flat on exit, one pass over the bars
+    
+    Returns:
+        Tuple of (equity, trades, wins); equity has init_cash prepended
+    """
+    n = close.shape[0]
+    equity = np.empty(n + 1, dtype=np.float64)
+    equity[0] = init_cash
+    capital = init_cash
+    position = 0.0
+    entry_price = 0.0
+    trades = 0
+    wins = 0
+    
+    for i in range(n):
+        price = close[i]
+        if entries[i] and position == 0.0:
+            position = capital / price
+            entry_price = price
+            capital = 0.0
+        elif exits[i] and position > 0.0:
+            capital = position * price
+            position = 0.0
+            trades += 1
+            if price > entry_price:
+                wins += 1
+        equity[i + 1] = capital + position * price
+    
+    return equity, trades, wins
+
+
+@njit(cache=True)
+def _sma_crossover(close: np.ndarray, fast_win: int, slow_win: int) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Fast/slow SMA crossover in one pass using running window sums
+    
+    Returns:
+        Tuple of (entries, exits) boolean arrays
+    """
+    n = close.shape[0]
+    entries = np.zeros(n, dtype=np.bool_)
+    exits = np.zeros(n, dtype=np.bool_)
+    first = max(fast_win, slow_win) - 1
+    fast_sum = 0.0
+    slow_sum = 0.0
+    prev_fast = 0.0
+    prev_slow = 0.0
+    
+    for i in range(n):
+        fast_sum += close[i]
+        slow_sum += close[i]
+        if i >= fast_win:
+            fast_sum -= close[i - fast_win]
+        if i >= slow_win:
+            slow_sum -= close[i - slow_win]
+        if i >= first:
+            fast = fast_sum / fast_win
+            slow = slow_sum / slow_win
+            if i > first:
+                entries[i] = fast > slow and prev_fast <= prev_slow
+                exits[i] = fast < slow and prev_fast >= prev_slow
+            prev_fast = fast
+            prev_slow = slow
+    
+    return entries, exits
+
+
 class VectorBTAdapter:
     """
     Adapter for running vectorized backtests
     Uses vectorbt if available, otherwise falls back to pandas-based simulation
     """
     
-    def run_backtest(self, strategy_config: Dict, price_data: List[Dict], initial_capital: float = 10000.0) -> Dict:
+    def __init__(self):
+        # Backend is fixed at import time; bind it once instead of branching per call
+        self._runner = self._run_with_vectorbt if HAS_VECTORBT else self._run_with_pandas
+    
+    def run_backtest(
+        self,
+        strategy_config: Dict,
+        price_data: Union[List[Dict], pd.DataFrame],
+        initial_capital: float = 10000.0
+    ) -> Dict:
         """
         Run backtest using provided price data and strategy configuration
+        
+        price_data may be a list of row dicts (e.g. from Supabase) or a
+        DataFrame indexed by time, which is used without conversion.
         """
-        if not price_data:
+        if price_data is None or len(price_data) == 0:
             logger.warning("No price data provided for backtest")
             return self._empty_result()
 
-        # Convert list of dicts to DataFrame
-        df = pd.DataFrame(price_data)
-        if 'time' in df.columns:
-            df['time'] = pd.to_datetime(df['time'])
-            df.set_index('time', inplace=True)
+        close, index = self.prepare_close(price_data)
+        return self.run_on_close(strategy_config, close, initial_capital, index)
+
+    def prepare_close(self, price_data: Union[List[Dict], pd.DataFrame]) -> Tuple[np.ndarray, Optional[pd.Index]]:
+        """
+        Extract the close column as one C-contiguous float32 array
         
-        # Ensure numeric types
-        for col in ['open', 'high', 'low', 'close', 'volume']:
-            if col in df.columns:
-                df[col] = pd.to_numeric(df[col])
+        Prices only feed comparisons and ratios, so single precision is
+        enough; the kernels accumulate sums, capital and equity in float64.
+        Row dicts are read straight into arrays without building a DataFrame,
+        and timestamps are only parsed when vectorbt needs an index.
+        
+        Returns:
+            Tuple of (close, time index or None)
+        """
+        if isinstance(price_data, pd.DataFrame):
+            close = price_data['close']
+            if not pd.api.types.is_numeric_dtype(close):
+                close = pd.to_numeric(close)
+            index = price_data.index
+            if HAS_VECTORBT and 'time' in price_data.columns:
+                index = pd.DatetimeIndex(pd.to_datetime(price_data['time']))
+            return np.ascontiguousarray(close.to_numpy(), dtype=np.float32), index
+        
+        # Row dicts (e.g. from Supabase)
+        close = np.fromiter(
+            (float(row['close']) for row in price_data),
+            dtype=np.float32,
+            count=len(price_data)
+        )
+        index = None
+        if HAS_VECTORBT and 'time' in price_data[0]:
+            index = pd.DatetimeIndex(
+                pd.to_datetime([row['time'] for row in price_data], format='ISO8601', cache=True)
+            )
+        return close, index
 
+    def run_on_close(
+        self,
+        strategy_config: Dict,
+        close: np.ndarray,
+        initial_capital: float = 10000.0,
+        index: Optional[pd.Index] = None
+    ) -> Dict:
+        """Run backtest on a prepared close array (see prepare_close)"""
         # Generate signals based on strategy rules
-        # For now, we simulate signal generation by iterating (hybrid approach)
         # In a full vbt implementation, we would convert rules to vector expressions
-        entries, exits = self._generate_signals(strategy_config, df)
+        entries, exits = self._generate_signals(strategy_config, close)
+        if len(entries) != len(close) or len(exits) != len(close):
+            raise ValueError(
+                f"Signal length mismatch: {len(entries)}/{len(exits)} signals for {len(close)} bars"
+            )
         
-        if HAS_VECTORBT:
-            return self._run_with_vectorbt(df, entries, exits, initial_capital)
-        else:
-            return self._run_with_pandas(df, entries, exits, initial_capital)
+        return self._runner(close, entries, exits, initial_capital, index)
 
-    def _generate_signals(self, strategy: Dict, df: pd.DataFrame) -> Tuple[pd.Series, pd.Series]:
+    def _generate_signals(self, strategy: Dict, close: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
         """
-        Generate entry/exit boolean series based on strategy rules.
+        Generate entry/exit boolean arrays based on strategy rules.
         Currently uses a simplified logic or the StrategyExecutor for each row.
         """
         # This is where we would ideally vectorize the strategy rules.
@@ -59,26 +183,24 @@ class VectorBTAdapter:
         # if the strategy is "Moving Average", otherwise we might default to random for testing
         # or actually call StrategyExecutor (which is slow but accurate).
         
-        entries = pd.Series(False, index=df.index)
-        exits = pd.Series(False, index=df.index)
-        
-        # simplified SMA Crossover for testing
-        close = df['close']
-        fast_ma = close.rolling(window=10).mean()
-        slow_ma = close.rolling(window=20).mean()
-        
-        entries = (fast_ma > slow_ma) & (fast_ma.shift(1) <= slow_ma.shift(1))
-        exits = (fast_ma < slow_ma) & (fast_ma.shift(1) >= slow_ma.shift(1))
-        
-        return entries, exits
+        # simplified SMA Crossover for testing; windows can be swept via parameters
+        params = strategy.get('parameters', {})
+        return _sma_crossover(close, int(params.get('fast_window', 10)), int(params.get('slow_window', 20)))
 
-    def _run_with_vectorbt(self, df: pd.DataFrame, entries: pd.Series, exits: pd.Series, init_cash: float) -> Dict:
+    def _run_with_vectorbt(
+        self,
+        close: np.ndarray,
+        entries: np.ndarray,
+        exits: np.ndarray,
+        init_cash: float,
+        index: pd.Index
+    ) -> Dict:
         """Run backtest using VectorBT"""
         try:
             portfolio = vbt.Portfolio.from_signals(
-                close=df['close'],
-                entries=entries,
-                exits=exits,
+                close=pd.Series(close, index=index),
+                entries=pd.Series(entries, index=index),
+                exits=pd.Series(exits, index=index),
                 init_cash=init_cash,
                 freq='1m' # Assuming 1m data
             )
@@ -94,36 +216,24 @@ class VectorBTAdapter:
                 'total_return': float(stats['Total Return'] * 100),
                 'winning_trades': int(stats['Win Rate'] * stats['Total Trades']), # Estimate
                 'losing_trades': int((1 - stats['Win Rate']) * stats['Total Trades']), # Estimate
-                'equity_curve': portfolio.value().tolist(),
+                'equity_curve': portfolio.value().to_numpy(),
                 'status': 'success'
             }
         except Exception as e:
             logger.error(f"VectorBT execution failed: {e}")
-            return self._run_with_pandas(df, entries, exits, init_cash) # Fallback
-
-    def _run_with_pandas(self, df: pd.DataFrame, entries: pd.Series, exits: pd.Series, init_cash: float) -> Dict:
-        """Fallback pandas-based backtest"""
-        capital = init_cash
-        position = 0
-        trades = 0
-        wins = 0
-        equity = [init_cash]
+            return self._run_with_pandas(close, entries, exits, init_cash) # Fallback
+
+    def _run_with_pandas(
+        self,
+        close: np.ndarray,
+        entries: np.ndarray,
+        exits: np.ndarray,
+        init_cash: float,
+        index: Optional[pd.Index] = None
+    ) -> Dict:
+        """Fallback backtest: compiled state-machine loop over NumPy arrays"""
+        equity, trades, wins = _pandas_backtest_loop(close, entries, exits, float(init_cash))
         
-        for i in range(len(df)):
-            price = df['close'].iloc[i]
-            if entries.iloc[i] and position == 0:
-                position = capital / price
-                capital = 0
-            elif exits.iloc[i] and position > 0:
-                capital = position * price
-                position = 0
-                trades += 1
-                if capital > equity[-1]: # profitable trade logic simplified
-                     wins += 1 # This is not quite right, need to track trade entry price
-            
-            current_val = capital + (position * price)
-            equity.append(current_val)
-            
         total_return = (equity[-1] - init_cash) / init_cash * 100
         win_rate = (wins / trades * 100) if trades > 0 else 0
         
@@ -133,7 +243,7 @@ class VectorBTAdapter:
             'profit_factor': 1.5, # Dummy
             'sharpe_ratio': 1.0, # Dummy
             'max_drawdown': 5.0, # Dummy
-            'total_return': total_return,
+            'total_return': float(total_return),
             'equity_curve': equity,
             'status': 'fallback_success'
         }
@@ -141,7 +251,7 @@ class VectorBTAdapter:
     def _empty_result(self):
         return {
             'total_trades': 0, 'win_rate': 0, 'sharpe_ratio': 0, 
-            'max_drawdown': 0, 'total_return': 0, 'equity_curve': []
+            'max_drawdown': 0, 'total_return': 0, 'equity_curve': np.empty(0)
         }
 
 vectorbt_adapter = VectorBTAdapter()
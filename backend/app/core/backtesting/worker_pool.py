@@ -0,0 +1,138 @@
+"""
+Backtest Worker Pool
+Runs CPU-bound backtests in separate processes so they don't block the event loop
+"""
+
+import asyncio
+import logging
+import os
+from concurrent.futures import ProcessPoolExecutor
+from multiprocessing import shared_memory
+from typing import Dict, List, Optional, Union
+
+import numpy as np
+import pandas as pd
+
+from app.config import settings
+
+logger = logging.getLogger(__name__)
+
+
+def run_backtest_sync(
+    strategy_config: Dict,
+    price_data: Union[List[Dict], pd.DataFrame],
+    initial_capital: float
+) -> Dict:
+    """Module-level (picklable) entry point executed inside a worker process"""
+    from app.core.backtesting.vectorbt_adapter import vectorbt_adapter
+
+    return vectorbt_adapter.run_backtest(strategy_config, price_data, initial_capital)
+
+
+def run_backtest_shared(
+    shm_name: str,
+    length: int,
+    strategy_config: Dict,
+    initial_capital: float
+) -> Dict:
+    """Worker entry point for sweeps: run on a close array in shared memory"""
+    from app.core.backtesting.vectorbt_adapter import vectorbt_adapter
+
+    shm = shared_memory.SharedMemory(name=shm_name)
+    try:
+        close = np.ndarray((length,), dtype=np.float32, buffer=shm.buf)
+        result = vectorbt_adapter.run_on_close(strategy_config, close, initial_capital)
+        del close  # Release the buffer view before closing the segment
+        return result
+    finally:
+        shm.close()
+
+
+class BacktestWorkerPool:
+    """
+    Process pool for backtest execution
+
+    vectorbt/Numba simulations hold the GIL for their whole run, so they are
+    shipped to worker processes instead of running on the API event loop.
+    """
+
+    def __init__(self, max_workers: Optional[int] = None):
+        self.max_workers = max_workers or os.cpu_count() or 1
+        self.executor: Optional[ProcessPoolExecutor] = None
+
+    def start(self):
+        """Create the process pool"""
+        if not self.executor:
+            self.executor = ProcessPoolExecutor(max_workers=self.max_workers)
+            logger.info(f"✅ Backtest worker pool started ({self.max_workers} workers)")
+
+    def stop(self):
+        """Shut down the pool, cancelling backtests that haven't started"""
+        if self.executor:
+            self.executor.shutdown(wait=False, cancel_futures=True)
+            self.executor = None
+            logger.info("🛑 Backtest worker pool stopped")
+
+    async def run_backtest(
+        self,
+        strategy_config: Dict,
+        price_data: Union[List[Dict], pd.DataFrame],
+        initial_capital: float
+    ) -> Dict:
+        """
+        Run a backtest in a worker process
+
+        Falls back to the default thread executor when the pool is not running
+        (e.g. scripts and tests that don't go through app startup).
+        """
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(
+            self.executor,
+            run_backtest_sync,
+            strategy_config,
+            price_data,
+            float(initial_capital)
+        )
+
+    
+    async def run_backtests(
+        self,
+        configs: List[Dict],
+        price_data: Union[List[Dict], pd.DataFrame],
+        initial_capital: float
+    ) -> List[Dict]:
+        """
+        Run one backtest per strategy config over the same price data
+        
+        The close series is placed in shared memory once; workers attach to
+        it instead of receiving a pickled copy per task. Results are returned
+        in the same order as configs.
+        """
+        from app.core.backtesting.vectorbt_adapter import vectorbt_adapter
+        
+        if price_data is None or len(price_data) == 0:
+            return [vectorbt_adapter._empty_result() for _ in configs]
+        
+        close, _ = vectorbt_adapter.prepare_close(price_data)
+        shm = shared_memory.SharedMemory(create=True, size=close.nbytes)
+        try:
+            np.ndarray(close.shape, dtype=close.dtype, buffer=shm.buf)[:] = close
+            loop = asyncio.get_running_loop()
+            return await asyncio.gather(*(
+                loop.run_in_executor(
+                    self.executor,
+                    run_backtest_shared,
+                    shm.name,
+                    len(close),
+                    config,
+                    float(initial_capital)
+                )
+                for config in configs
+            ))
+        finally:
+            shm.close()
+            shm.unlink()
+
+
+# Global instance
+backtest_pool = BacktestWorkerPool(settings.BACKTEST_WORKERS)
@@ -5,11 +5,46 @@ Distributes signals via Telegram
 
 import asyncio
 import logging
+import httpx
+import orjson
 from typing import Optional
 from datetime import datetime
 
 logger = logging.getLogger(__name__)
 
+# Message templates are built once; only the field values change per send
+_SIGNAL_TEMPLATE = """🚀 *TraderCopilot Signal* 🚀
+
+{direction_emoji} *{symbol} - {direction}*
+
+📊 *Trade Details:*
+• Entry: `{entry_price}`
+• Stop Loss: `{stop_loss}`
+• Take Profit: `{take_profit}`
+
+📈 *Statistics:*
+• Signal Score: `{signal_score}/10` ⭐
+• Probability: `{probability_score}%` 🎯
+• Confidence: `{confidence_level}` 
+• Risk: `{risk_rating}`
+• Position Size: `{position_sizing}%`
+
+💡 *Analysis:*
+{trade_explanation}
+
+⏰ Time: {now}"""
+
+_STATS_TEMPLATE = """
+📊 *TraderCopilot Statistics* 📊
+
+• Active Signals: {active_signals}
+• Avg Score: {avg_score}/10
+• Avg Probability: {avg_probability}%
+• Win Rate: {win_rate}%
+
+✨ System Status: Operational
+"""
+
 
 class TelegramBot:
     """
@@ -29,6 +64,14 @@ class TelegramBot:
         self.channel_id = channel_id
         self.enabled = bool(bot_token and channel_id)
         
+        # Long-lived client so sends reuse the warm TLS connection
+        self._client = httpx.AsyncClient(
+            http2=True,
+            timeout=10.0,
+            limits=httpx.Limits(max_keepalive_connections=10, max_connections=20),
+            headers={"Content-Type": "application/json"}
+        )
+        
         if self.enabled:
             logger.info("✅ Telegram bot initialized")
         else:
@@ -49,9 +92,6 @@ class TelegramBot:
         message = self._format_signal_message(signal)
         
         try:
-             # Use httpx for async HTTP request to Telegram API
-            import httpx
-            
             url = f"https://api.telegram.org/bot{self.bot_token}/sendMessage"
             payload = {
                 "chat_id": self.channel_id,
@@ -59,10 +99,9 @@ class TelegramBot:
                 "parse_mode": "Markdown"
             }
             
-            async with httpx.AsyncClient() as client:
-                response = await client.post(url, json=payload, timeout=10.0)
-                response.raise_for_status()
-                
+            response = await self._client.post(url, content=orjson.dumps(payload))
+            response.raise_for_status()
+            
             logger.info(f"📱 Telegram: {signal['symbol']} {signal['direction']} signal sent")
             
         except Exception as e:
@@ -74,41 +113,20 @@ class TelegramBot:
         
         Returns formatted markdown message
         """
-        direction_emoji = "🟢" if signal['direction'] == 'BUY' else "🔴"
-        
-        message = f"""
-🚀 *TraderCopilot Signal* 🚀
-
-{direction_emoji} *{signal['symbol']} - {signal['direction']}*
-
-📊 *Trade Details:*
-• Entry: `{signal['entry_price']}`
-• Stop Loss: `{signal['stop_loss']}`
-• Take Profit: `{signal['take_profit']}`
-
-📈 *Statistics:*
-• Signal Score: `{signal['signal_score']}/10` ⭐
-• Probability: `{signal['probability_score']}%` 🎯
-• Confidence: `{signal['confidence_level']}` 
-• Risk: `{signal['risk_rating']}`
-• Position Size: `{signal['position_sizing']}%`
-
-💡 *Analysis:*
-{signal['trade_explanation']}
-
-⏰ Time: {datetime.utcnow().strftime('%Y-%m-%d %H:%M UTC')}
-"""
-        return message.strip()
+        fmt = {
+            **signal,
+            'direction_emoji': "🟢" if signal['direction'] == 'BUY' else "🔴",
+            'now': datetime.utcnow().strftime('%Y-%m-%d %H:%M UTC')
+        }
+        return _SIGNAL_TEMPLATE.format_map(fmt)
     
     async def send_alert(self, message: str):
         """Send general alert message"""
         if self.enabled:
              try:
-                import httpx
                 url = f"https://api.telegram.org/bot{self.bot_token}/sendMessage"
                 payload = {"chat_id": self.channel_id, "text": f"⚠️ *ALERT*: {message}", "parse_mode": "Markdown"}
-                async with httpx.AsyncClient() as client:
-                    await client.post(url, json=payload)
+                await self._client.post(url, content=orjson.dumps(payload))
              except Exception:
                  pass
 
@@ -117,25 +135,24 @@ class TelegramBot:
         if not self.enabled:
             return
         
-        message = f"""
-📊 *TraderCopilot Statistics* 📊
-
-• Active Signals: {stats.get('active_signals', 0)}
-• Avg Score: {stats.get('avg_score', 0)}/10
-• Avg Probability: {stats.get('avg_probability', 0)}%
-• Win Rate: {stats.get('win_rate', 0)}%
-
-✨ System Status: Operational
-"""
+        message = _STATS_TEMPLATE.format(
+            active_signals=stats.get('active_signals', 0),
+            avg_score=stats.get('avg_score', 0),
+            avg_probability=stats.get('avg_probability', 0),
+            win_rate=stats.get('win_rate', 0)
+        )
+        
         try:
-            import httpx
             url = f"https://api.telegram.org/bot{self.bot_token}/sendMessage"
             payload = {"chat_id": self.channel_id, "text": message, "parse_mode": "Markdown"}
-            async with httpx.AsyncClient() as client:
-                await client.post(url, json=payload)
+            await self._client.post(url, content=orjson.dumps(payload))
             logger.info("📱 Telegram: Stats update sent")
         except Exception as e:
             logger.error(f"Failed to send Telegram stats: {e}")
+    
+    async def close(self):
+        """Close the pooled HTTP client"""
+        await self._client.aclose()
 
 
 # Global instance
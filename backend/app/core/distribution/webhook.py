@@ -1,6 +1,8 @@
 
+import asyncio
 import logging
 import httpx
+import orjson
 from typing import Dict, List, Optional
 from datetime import datetime
 
@@ -15,6 +17,13 @@ class WebhookManager:
         self.webhooks = [] # List of registered webhook URLs
         # In production, load from DB
         
+        # Long-lived client so sends reuse pooled connections
+        self._client = httpx.AsyncClient(
+            http2=True,
+            timeout=5.0,
+            limits=httpx.Limits(max_keepalive_connections=10, max_connections=20)
+        )
+        
     async def register_webhook(self, url: str, secret: str = None):
         """Register a new webhook endpoint"""
         self.webhooks.append({'url': url, 'secret': secret, 'active': True})
@@ -29,17 +38,24 @@ class WebhookManager:
             
         logger.info(f"🔗 Broadcasting signal to {len(self.webhooks)} webhooks")
         
-        async with httpx.AsyncClient() as client:
-            for webhook in self.webhooks:
-                if not webhook['active']:
-                    continue
-                    
-                try:
-                    # payload = signal # Send raw signal or formatted?
-                    # Using raw signal for webhooks usually best
-                    await client.post(webhook['url'], json=signal, timeout=5.0)
-                    logger.debug(f"Webhook sent to {webhook['url']}")
-                except Exception as e:
-                    logger.error(f"Failed to send webhook to {webhook.get('url')}: {e}")
+        # Using raw signal for webhooks usually best; serialize once, send to all concurrently
+        payload = orjson.dumps(signal, default=str, option=orjson.OPT_SERIALIZE_NUMPY)
+        headers = {"Content-Type": "application/json"}
+        active = [webhook for webhook in self.webhooks if webhook['active']]
+        results = await asyncio.gather(
+            *(self._client.post(webhook['url'], content=payload, headers=headers) for webhook in active),
+            return_exceptions=True
+        )
+        
+        for webhook, result in zip(active, results):
+            if isinstance(result, Exception):
+                logger.error(f"Failed to send webhook to {webhook.get('url')}: {result}")
+            else:
+                logger.debug(f"Webhook sent to {webhook['url']}")
+    
+    async def close(self):
+        """Close the pooled HTTP client"""
+        await self._client.aclose()
 
+# Global instance
 webhook_manager = WebhookManager()
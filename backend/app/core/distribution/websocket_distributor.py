@@ -4,14 +4,26 @@ Pushes signals to connected clients in real-time
 """
 
 import asyncio
-import json
 import logging
-from typing import Set
-from datetime import datetime
+import orjson
+from typing import List
+from datetime import datetime, timezone
 from fastapi import WebSocket, WebSocketDisconnect
 
 logger = logging.getLogger(__name__)
 
+# Clients sent to concurrently before yielding to the event loop
+SEND_BATCH = 50
+
+
+def _dumps(message: dict) -> str:
+    """Serialize a message with orjson (datetimes as UTC 'Z' timestamps)"""
+    return orjson.dumps(
+        message,
+        option=orjson.OPT_UTC_Z | orjson.OPT_SERIALIZE_NUMPY,
+        default=str
+    ).decode()
+
 
 class SignalDistributor:
     """
@@ -19,7 +31,8 @@ class SignalDistributor:
     """
     
     def __init__(self):
-        self.active_connections: Set[WebSocket] = set()
+        # Plain list: iterates faster than a set and clients are few dozen at most
+        self.active_connections: List[WebSocket] = []
         self.connection_count = 0
         self.heartbeat_task = None
         
@@ -40,7 +53,7 @@ class SignalDistributor:
             self.heartbeat_task = None
             
         # Close all active connections
-        for connection in list(self.active_connections):
+        for connection in tuple(self.active_connections):
             await connection.close()
         self.active_connections.clear()
         logger.info("🛑 WebSocket Distributor stopped")
@@ -48,23 +61,54 @@ class SignalDistributor:
     async def connect(self, websocket: WebSocket):
         """Accept new WebSocket connection"""
         await websocket.accept()
-        self.active_connections.add(websocket)
+        self.active_connections.append(websocket)
         self.connection_count += 1
         logger.info(f"✅ New WebSocket client connected (Total: {len(self.active_connections)})")
         
         # Send welcome message
-        await websocket.send_json({
+        await websocket.send_text(_dumps({
             "type": "connection",
             "status": "connected",
             "message": "TraderCopilot Signal Feed",
-            "timestamp": datetime.utcnow().isoformat()
-        })
+            "timestamp": datetime.now(timezone.utc)
+        }))
     
     def disconnect(self, websocket: WebSocket):
         """Remove disconnected client"""
-        self.active_connections.discard(websocket)
+        try:
+            self.active_connections.remove(websocket)
+        except ValueError:
+            return  # Already removed
         logger.info(f"❌ Client disconnected (Remaining: {len(self.active_connections)})")
     
+    async def _send_all(self, message: dict) -> List[WebSocket]:
+        """
+        Send a message to every client concurrently
+        
+        The message is serialized once and sent as text to all connections,
+        SEND_BATCH clients at a time with a yield to the event loop in between
+        so large fan-outs don't hold up market data handling.
+        
+        Returns:
+            Connections whose send failed
+        """
+        payload = _dumps(message)
+        connections = tuple(self.active_connections)
+        
+        failed = []
+        for start in range(0, len(connections), SEND_BATCH):
+            batch = connections[start:start + SEND_BATCH]
+            results = await asyncio.gather(
+                *(connection.send_text(payload) for connection in batch),
+                return_exceptions=True
+            )
+            for connection, result in zip(batch, results):
+                if isinstance(result, Exception):
+                    logger.error(f"Error sending to client: {result}")
+                    failed.append(connection)
+            await asyncio.sleep(0)
+        return failed
+    
     async def broadcast_signal(self, signal: dict):
         """
         Broadcast signal to all connected clients
@@ -79,23 +123,51 @@ class SignalDistributor:
         message = {
             "type": "signal",
             "data": signal,
-            "timestamp": datetime.utcnow().isoformat()
+            "timestamp": datetime.now(timezone.utc)
         }
         
         # Send to all connected clients
-        disconnected = set()
-        for connection in self.active_connections:
-            try:
-                await connection.send_json(message)
-                logger.info(f"📤 Signal sent to client: {signal['symbol']} {signal['direction']}")
-            except Exception as e:
-                logger.error(f"Error sending to client: {e}")
-                disconnected.add(connection)
+        disconnected = await self._send_all(message)
+        logger.info(
+            f"📤 Signal sent to {len(self.active_connections) - len(disconnected)} clients: "
+            f"{signal['symbol']} {signal['direction']}"
+        )
         
         # Remove failed connections
         for conn in disconnected:
             self.disconnect(conn)
     
+    async def broadcast_signals(self, signals: List[dict]):
+        """
+        Broadcast several signals to all connected clients in one message
+        
+        A single signal is sent as a regular "signal" message.
+        
+        Args:
+            signals: Signal dictionaries to broadcast
+        """
+        if len(signals) == 1:
+            await self.broadcast_signal(signals[0])
+            return
+        
+        if not self.active_connections:
+            logger.warning("No clients connected to receive signals")
+            return
+        
+        message = {
+            "type": "signals",
+            "data": signals,
+            "timestamp": datetime.now(timezone.utc)
+        }
+        
+        disconnected = await self._send_all(message)
+        logger.info(
+            f"📤 {len(signals)} signals sent to {len(self.active_connections) - len(disconnected)} clients"
+        )
+        
+        for conn in disconnected:
+            self.disconnect(conn)
+    
     async def broadcast_update(self, update_type: str, data: dict):
         """
         Broadcast general update to clients
@@ -107,14 +179,11 @@ class SignalDistributor:
         message = {
             "type": update_type,
             "data": data,
-            "timestamp": datetime.utcnow().isoformat()
+            "timestamp": datetime.now(timezone.utc)
         }
         
-        for connection in self.active_connections:
-            try:
-                await connection.send_json(message)
-            except:
-                pass
+        for conn in await self._send_all(message):
+            self.disconnect(conn)
     
     async def send_heartbeat(self):
         """Send periodic heartbeat to keep connections alive"""
@@ -124,15 +193,12 @@ class SignalDistributor:
             if self.active_connections:
                 message = {
                     "type": "heartbeat",
-                    "timestamp": datetime.utcnow().isoformat(),
+                    "timestamp": datetime.now(timezone.utc),
                     "active_signals": 0  # Would fetch from DB
                 }
                 
-                for connection in list(self.active_connections):
-                    try:
-                        await connection.send_json(message)
-                    except:
-                        self.disconnect(connection)
+                for conn in await self._send_all(message):
+                    self.disconnect(conn)
 
 
 # Global distributor instance
@@ -3,9 +3,22 @@
 from typing import Dict, Any, List, Optional
 from datetime import datetime
 import logging
+import numpy as np
 
 logger = logging.getLogger(__name__)
 
+# Trading sessions (UTC), resolved once per hour of day
+# Tokyo: 00:00 - 09:00
+# London: 08:00 - 16:00 (Tokyo takes the 08:00 overlap)
+# New York: 13:00 - 22:00
+_SESSION_BY_HOUR = tuple(
+    "tokyo" if hour < 9 else
+    "london" if hour < 13 else
+    "new_york" if hour < 22 else
+    "after_hours"
+    for hour in range(24)
+)
+
 
 class ContextBuilder:
     """Builds comprehensive context for Gemini AI analysis"""
@@ -51,6 +64,45 @@ class ContextBuilder:
             "relevant_knowledge": relevant_knowledge
         }
     
+    @staticmethod
+    def build_strategy_stats(name: str, trades: np.ndarray) -> Dict[str, Any]:
+        """
+        Compute strategy statistics from an array of per-trade PnL.
+        
+        Args:
+            name: Strategy name
+            trades: (N,) array of trade PnL
+        
+        Returns:
+            Dict with the same keys as strategy_stats in build_signal_context
+        """
+        pnl = np.asarray(trades, dtype=np.float64)
+        total_trades = len(pnl)
+        if total_trades == 0:
+            return {
+                "name": name,
+                "win_rate": 0.0,
+                "sharpe": 0.0,
+                "total_trades": 0,
+                "expectancy": 0.0,
+                "profit_factor": 0.0,
+            }
+        
+        wins = pnl > 0
+        _, winning_trades = np.bincount(wins, minlength=2)
+        gross_profit = pnl[wins].sum()
+        gross_loss = -pnl[~wins].sum()
+        std = pnl.std(ddof=1) if total_trades > 1 else 0.0
+        
+        return {
+            "name": name,
+            "win_rate": float(winning_trades / total_trades * 100),
+            "sharpe": float(pnl.mean() / std * np.sqrt(252)) if std > 0 else 0.0,
+            "total_trades": total_trades,
+            "expectancy": float(pnl.mean()),
+            "profit_factor": float(gross_profit / gross_loss) if gross_loss > 0 else 0.0,
+        }
+    
     @staticmethod
     def _build_market_conditions(market_data: Optional[Dict]) -> Dict[str, Any]:
         """Extract market regime and conditions"""
@@ -74,21 +126,7 @@ class ContextBuilder:
     @staticmethod
     def _get_current_session() -> str:
         """Determine current trading session based on UTC time"""
-        hour = datetime.utcnow().hour
-        
-        # Trading sessions (UTC)
-        # Tokyo: 00:00 - 09:00
-        # London: 08:00 - 16:00
-        # New York: 13:00 - 22:00
-        
-        if 0 <= hour < 9:
-            return "tokyo"
-        elif 8 <= hour < 13:
-            return "london"
-        elif 13 <= hour < 22:
-            return "new_york"
-        else:
-            return "after_hours"
+        return _SESSION_BY_HOUR[datetime.utcnow().hour]
     
     @staticmethod
     def format_signal_candidate(
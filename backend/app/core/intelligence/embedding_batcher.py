@@ -0,0 +1,112 @@
+"""
+Embedding Micro-Batcher
+Coalesces concurrent embedding requests into batched Gemini calls
+"""
+
+import asyncio
+import logging
+from typing import List, Tuple
+
+from app.core.intelligence.gemini_client import gemini_client
+
+logger = logging.getLogger(__name__)
+
+BATCH_MAX = 32
+BATCH_WAIT_MS = 10
+
+
+class EmbeddingBatcher:
+    """
+    Collects embedding requests for up to BATCH_WAIT_MS (or BATCH_MAX items)
+    and resolves them with a single generate_embeddings call
+    """
+
+    def __init__(self, max_batch: int = BATCH_MAX, max_wait_ms: int = BATCH_WAIT_MS):
+        self.max_batch = max_batch
+        self.max_wait = max_wait_ms / 1000.0
+        self.queue: asyncio.Queue = asyncio.Queue()
+        self.worker_task = None
+
+    async def start(self):
+        """Start the batching worker"""
+        if not self.worker_task:
+            self.worker_task = asyncio.create_task(self._worker())
+            logger.info("✅ Embedding batcher started")
+
+    async def stop(self):
+        """Stop the worker and fail any requests still queued"""
+        if self.worker_task:
+            self.worker_task.cancel()
+            try:
+                await self.worker_task
+            except asyncio.CancelledError:
+                pass
+            self.worker_task = None
+
+        while not self.queue.empty():
+            _, future = self.queue.get_nowait()
+            if not future.done():
+                future.set_exception(RuntimeError("Embedding batcher stopped"))
+        logger.info("🛑 Embedding batcher stopped")
+
+    async def embed(self, text: str) -> List[float]:
+        """
+        Queue text for embedding and wait for its batch to complete
+
+        Falls back to a direct call when the worker is not running
+        (e.g. scripts and tests that don't go through app startup).
+        """
+        if not self.worker_task:
+            return await gemini_client.generate_embedding(text)
+
+        future = asyncio.get_running_loop().create_future()
+        await self.queue.put((text, future))
+        return await future
+
+    async def _worker(self):
+        """Drain the queue into batches and embed them"""
+        loop = asyncio.get_running_loop()
+
+        while True:
+            batch = [await self.queue.get()]
+            deadline = loop.time() + self.max_wait
+
+            try:
+                while len(batch) < self.max_batch:
+                    timeout = deadline - loop.time()
+                    if timeout <= 0:
+                        break
+                    try:
+                        batch.append(await asyncio.wait_for(self.queue.get(), timeout))
+                    except asyncio.TimeoutError:
+                        break
+
+                await self._process_batch(batch)
+            except asyncio.CancelledError:
+                # Requests already taken off the queue would otherwise wait forever
+                for _, future in batch:
+                    if not future.done():
+                        future.set_exception(RuntimeError("Embedding batcher stopped"))
+                raise
+
+    async def _process_batch(self, batch: List[Tuple[str, asyncio.Future]]):
+        """Embed a batch and resolve each waiting request"""
+        texts = [text for text, _ in batch]
+
+        try:
+            embeddings = await gemini_client.generate_embeddings(texts)
+        except Exception as e:
+            logger.error(f"Embedding batch failed: {e}")
+            for _, future in batch:
+                if not future.done():
+                    future.set_exception(e)
+            return
+
+        logger.debug(f"Embedded batch of {len(texts)} texts")
+        for (_, future), embedding in zip(batch, embeddings):
+            if not future.done():
+                future.set_result(embedding.tolist())
+
+
+# Global instance
+embedding_batcher = EmbeddingBatcher()
@@ -3,9 +3,12 @@
 import google.generativeai as genai
 from google.generativeai.types import HarmCategory, HarmBlockThreshold
 from app.config import settings
+import asyncio
 import logging
 import json
-from typing import Dict, Any, Optional
+import numpy as np
+from collections import OrderedDict
+from typing import Dict, Any, List, Optional, Tuple
 
 logger = logging.getLogger(__name__)
 
@@ -20,6 +23,54 @@ SAFETY_SETTINGS = {
     HarmCategory.HARM_CATEGORY_DANGEROUS_CONTENT: HarmBlockThreshold.BLOCK_NONE,
 }
 
+EMBEDDING_MODEL = "models/embedding-001"
+EMBEDDING_DIM = 1536
+
+# Signal analysis prompt: invariant preamble and output spec are built once,
+# only the data block in between changes per signal
+_PROMPT_PREAMBLE = """You are a quantitative trading analyst for an institutional hedge fund.
+Analyze the following signal candidate and provide your institutional-grade assessment.
+
+"""
+
+_PROMPT_DATA_TEMPLATE = """**Signal Candidate:**
+- Symbol: {symbol}
+- Direction: {direction}
+- Entry Price: {entry}
+- Stop Loss: {stop_loss}
+- Take Profit: {take_profit}
+- Probability Score: {probability_score}%
+- Signal Score: {signal_score}/10
+
+**Strategy Statistics:**
+- Name: {name}
+- Win Rate: {win_rate}%
+- Sharpe Ratio: {sharpe}
+- Total Trades: {total_trades}
+- Expectancy: {expectancy}
+
+**Market Conditions:**
+- Regime: {regime}
+- Volatility: {volatility}
+- Session: {session}
+- Recent Events: {recent_news}
+{knowledge_section}
+"""
+
+_PROMPT_OUTPUT_SPEC = """
+**Required Output (JSON format):**
+Return a JSON object with these exact fields:
+{
+  "confidence_level": "High" | "Medium" | "Low",
+  "risk_rating": "Low" | "Medium" | "High" | "Very High",
+  "trade_explanation": "2-3 sentence institutional-grade explanation of setup validity",
+  "position_sizing": 0.5 to 5.0 (recommended % of capital),
+  "key_risks": ["risk 1", "risk 2", "risk 3"]
+}
+
+Be precise, data-driven, and focus on statistical validity.
+"""
+
 
 class GeminiClient:
     """Client for Google Gemini AI API"""
@@ -29,6 +80,9 @@ class GeminiClient:
             model_name=settings.GEMINI_MODEL,
             safety_settings=SAFETY_SETTINGS,
         )
+        # LRU of (model, text) -> embedding, so repeated searches skip the API
+        self.embedding_cache: "OrderedDict[Tuple[str, str], Tuple[float, ...]]" = OrderedDict()
+        self.embedding_cache_size = settings.EMBEDDING_CACHE_SIZE
         logger.info(f"Initialized Gemini client with model: {settings.GEMINI_MODEL}")
     
     async def analyze_signal_context(
@@ -107,45 +161,27 @@ class GeminiClient:
                 [f"- {item}" for item in knowledge[:3]]  # Top 3 items
             )
         
-        prompt = f"""You are a quantitative trading analyst for an institutional hedge fund.
-Analyze the following signal candidate and provide your institutional-grade assessment.
-
-**Signal Candidate:**
-- Symbol: {signal.get('symbol')}
-- Direction: {signal.get('direction')}
-- Entry Price: {signal.get('entry')}
-- Stop Loss: {signal.get('stop_loss')}
-- Take Profit: {signal.get('take_profit')}
-- Probability Score: {signal.get('probability_score')}%
-- Signal Score: {signal.get('signal_score')}/10
-
-**Strategy Statistics:**
-- Name: {stats.get('name')}
-- Win Rate: {stats.get('win_rate')}%
-- Sharpe Ratio: {stats.get('sharpe')}
-- Total Trades: {stats.get('total_trades')}
-- Expectancy: {stats.get('expectancy')}
-
-**Market Conditions:**
-- Regime: {market.get('regime')}
-- Volatility: {market.get('volatility')}
-- Session: {market.get('session')}
-- Recent Events: {', '.join(market.get('recent_news', []))}
-{knowledge_section}
-
-**Required Output (JSON format):**
-Return a JSON object with these exact fields:
-{{
-  "confidence_level": "High" | "Medium" | "Low",
-  "risk_rating": "Low" | "Medium" | "High" | "Very High",
-  "trade_explanation": "2-3 sentence institutional-grade explanation of setup validity",
-  "position_sizing": 0.5 to 5.0 (recommended % of capital),
-  "key_risks": ["risk 1", "risk 2", "risk 3"]
-}}
-
-Be precise, data-driven, and focus on statistical validity.
-"""
-        return prompt
+        # Only the data block is formatted per call; the fixed preamble and
+        # output spec are module constants
+        return _PROMPT_PREAMBLE + _PROMPT_DATA_TEMPLATE.format(
+            symbol=signal.get('symbol'),
+            direction=signal.get('direction'),
+            entry=signal.get('entry'),
+            stop_loss=signal.get('stop_loss'),
+            take_profit=signal.get('take_profit'),
+            probability_score=signal.get('probability_score'),
+            signal_score=signal.get('signal_score'),
+            name=stats.get('name'),
+            win_rate=stats.get('win_rate'),
+            sharpe=stats.get('sharpe'),
+            total_trades=stats.get('total_trades'),
+            expectancy=stats.get('expectancy'),
+            regime=market.get('regime'),
+            volatility=market.get('volatility'),
+            session=market.get('session'),
+            recent_news=', '.join(market.get('recent_news', [])),
+            knowledge_section=knowledge_section
+        ) + _PROMPT_OUTPUT_SPEC
     
     def _default_response(self) -> Dict[str, Any]:
         """Return safe default response if Gemini fails"""
@@ -162,22 +198,96 @@ Be precise, data-driven, and focus on statistical validity.
         """
         Generate text embedding for vector search.
         
+        Results are cached per (model, text); failed calls are not cached.
+        
         Args:
             text: Text to embed
         
         Returns:
             List of embedding values (1536 dimensions)
         """
+        cached = self._get_cached_embedding(text)
+        if cached is not None:
+            return cached
+        
         try:
             result = genai.embed_content(
-                model="models/embedding-001",
+                model=EMBEDDING_MODEL,
                 content=text,
                 task_type="retrieval_document"
             )
-            return result['embedding']
+            embedding = result['embedding']
+            self._cache_embedding(text, embedding)
+            return embedding
         except Exception as e:
             logger.error(f"Embedding generation error: {e}")
-            return [0.0] * 1536  # Return zero vector on error
+            return [0.0] * EMBEDDING_DIM  # Return zero vector on error
+    
+    async def generate_embeddings(self, texts: List[str], batch_size: int = 100) -> np.ndarray:
+        """
+        Generate embeddings for many texts with batched API calls.
+        
+        Uncached texts are sent in chunks of batch_size; chunks are requested
+        concurrently. A failed chunk yields zero vectors for its texts.
+        
+        Args:
+            texts: Texts to embed
+            batch_size: Maximum texts per API request
+        
+        Returns:
+            C-contiguous float32 array of shape (len(texts), EMBEDDING_DIM)
+        """
+        embeddings = np.zeros((len(texts), EMBEDDING_DIM), dtype=np.float32)
+        missing = []
+        for i, text in enumerate(texts):
+            cached = self._get_cached_embedding(text)
+            if cached is None:
+                missing.append(i)
+            else:
+                embeddings[i] = cached
+        
+        chunks = [missing[start:start + batch_size] for start in range(0, len(missing), batch_size)]
+        results = await asyncio.gather(
+            *(self._embed_batch([texts[i] for i in chunk]) for chunk in chunks)
+        )
+        
+        for chunk, chunk_embeddings in zip(chunks, results):
+            if chunk_embeddings is None:
+                continue  # Zero vectors already in place
+            embeddings[chunk] = chunk_embeddings
+            for i, embedding in zip(chunk, chunk_embeddings):
+                self._cache_embedding(texts[i], embedding)
+        
+        return embeddings
+    
+    async def _embed_batch(self, texts: List[str]) -> Optional[list]:
+        """Embed one batch of texts off the event loop; None on failure"""
+        try:
+            result = await asyncio.to_thread(
+                genai.embed_content,
+                model=EMBEDDING_MODEL,
+                content=texts,
+                task_type="retrieval_document"
+            )
+            return result['embedding']
+        except Exception as e:
+            logger.error(f"Batch embedding generation error: {e}")
+            return None
+    
+    def _get_cached_embedding(self, text: str) -> Optional[list]:
+        """Return cached embedding for text, if any"""
+        key = (EMBEDDING_MODEL, text)
+        cached = self.embedding_cache.get(key)
+        if cached is None:
+            return None
+        self.embedding_cache.move_to_end(key)
+        return list(cached)
+    
+    def _cache_embedding(self, text: str, embedding: list):
+        """Store embedding, evicting the least recently used entry when full"""
+        self.embedding_cache[(EMBEDDING_MODEL, text)] = tuple(embedding)
+        if len(self.embedding_cache) > self.embedding_cache_size:
+            self.embedding_cache.popitem(last=False)
 
 
 # Global client instance
@@ -21,9 +21,13 @@ class ExchangeWebSocket(ABC):
 
     async def _notify_callbacks(self, data: Dict):
         """Notify all registered callbacks with new data"""
+        await self._notify_callbacks_batch([data])
+
+    async def _notify_callbacks_batch(self, batch: List[Dict]):
+        """Notify all registered callbacks with a batch of updates"""
         for callback in self.callbacks:
             try:
-                await callback(data)
+                await callback(batch)
             except Exception as e:
                 logger.error(f"Error in callback: {e}")
 
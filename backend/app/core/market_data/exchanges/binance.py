@@ -1,82 +1,173 @@
 import asyncio
+import random
 import websockets
-import json
+import orjson
 import logging
-from typing import List, Dict
-from datetime import datetime
+from typing import List, Dict, Optional, Tuple
 from .base import ExchangeWebSocket
 
+# Try importing msgspec for typed kline decoding, fallback to orjson
+try:
+    import msgspec
+    HAS_MSGSPEC = True
+except ImportError:
+    HAS_MSGSPEC = False
+
 logger = logging.getLogger(__name__)
 
+BATCH_MAX = 64
+RECONNECT_MIN_DELAY = 1.0
+RECONNECT_MAX_DELAY = 60.0
+
+# (symbol, open time ms, open, high, low, close, volume, is_closed)
+Kline = Tuple[str, int, float, float, float, float, float, bool]
+
+if HAS_MSGSPEC:
+    class KlineInner(msgspec.Struct):
+        s: str
+        t: int
+        o: float
+        h: float
+        l: float
+        c: float
+        v: float
+        x: bool
+
+    class KlineMsg(msgspec.Struct):
+        k: KlineInner
+
+    # Binance sends prices as strings; lax mode converts them while decoding
+    _DECODER = msgspec.json.Decoder(KlineMsg, strict=False)
+
+    def _decode_kline(message) -> Optional[Kline]:
+        """Decode a kline event, or None for any other message"""
+        try:
+            k = _DECODER.decode(message).k
+        except msgspec.ValidationError:
+            return None
+        return (k.s, k.t, k.o, k.h, k.l, k.c, k.v, k.x)
+else:
+    def _decode_kline(message) -> Optional[Kline]:
+        """Decode a kline event, or None for any other message"""
+        k = orjson.loads(message).get('k')
+        if k is None:
+            return None
+        return (
+            k['s'], k['t'], float(k['o']), float(k['h']),
+            float(k['l']), float(k['c']), float(k['v']), k['x']
+        )
+
 class BinanceWebSocket(ExchangeWebSocket):
     """
     Binance WebSocket implementation for real-time kline data
     """
     
-    def __init__(self, symbols: List[str], interval: str = "1m"):
+    def __init__(self, symbols: List[str], interval: str = "1m", emit_ticks: bool = False):
         super().__init__(symbols, interval)
+        self.emit_ticks = emit_ticks  # Forward in-progress candle updates, not just closes
         self.ws_url = "wss://stream.binance.com:9443/ws"
+        # Binance expects lowercase symbols in stream names
+        self._url = f"{self.ws_url}/" + "/".join(
+            f"{s.lower()}@kline_{self.interval}" for s in self.symbols
+        )
         self.websocket = None
+        self.queue: asyncio.Queue = asyncio.Queue()
+        self.dispatch_task = None
         
     async def connect(self):
-        """Connect to Binance WebSocket"""
-        # Binance expects lowercase symbols in stream names
-        streams = [f"{s.lower()}@kline_{self.interval}" for s in self.symbols]
-        stream_path = "/".join(streams)
-        url = f"{self.ws_url}/{stream_path}"
-        
-        logger.info(f"Connecting to Binance WebSocket: {url}")
+        """Connect to Binance WebSocket, reconnecting with backoff until closed"""
+        self.running = True
+        self.dispatch_task = asyncio.create_task(self._dispatch())
+        backoff = RECONNECT_MIN_DELAY
         
         try:
-            self.websocket = await websockets.connect(url)
-            self.running = True
-            logger.info("✅ Connected to Binance WebSocket")
-            
-            # Start listening loop
-            await self._listen()
-            
-        except Exception as e:
-            logger.error(f"Binance WebSocket connection error: {e}")
-            self.running = False
+            while self.running:
+                logger.info(f"Connecting to Binance WebSocket: {self._url}")
+                try:
+                    self.websocket = await websockets.connect(
+                        self._url,
+                        compression=None,  # Skip permessage-deflate; frames are small JSON
+                        max_size=2**20,
+                        max_queue=1024,
+                        ping_interval=20,  # Close stalled connections instead of blocking forever
+                        ping_timeout=10
+                    )
+                    logger.info("✅ Connected to Binance WebSocket")
+                    backoff = RECONNECT_MIN_DELAY
+                    
+                    # Start listening loop
+                    await self._listen()
+                    
+                except Exception as e:
+                    logger.error(f"Binance WebSocket connection error: {e}")
+                    
+                if not self.running:
+                    break
+                delay = backoff + random.random()
+                logger.info(f"Reconnecting to Binance in {delay:.1f}s")
+                await asyncio.sleep(delay)
+                backoff = min(backoff * 2, RECONNECT_MAX_DELAY)
+        finally:
+            await self._stop_dispatch()
             
     async def _listen(self):
-        """Listen for incoming messages"""
+        """Listen for incoming messages until the connection drops"""
         try:
             async for message in self.websocket:
                 if not self.running:
                     break
                     
-                data = json.loads(message)
-                
                 # Parse kline data
-                if 'k' in data:
-                    kline = data['k']
-                    
-                    candle_data = {
-                        'symbol': kline['s'],
-                        'timestamp': datetime.fromtimestamp(kline['t'] / 1000),
-                        'open': float(kline['o']),
-                        'high': float(kline['h']),
-                        'low': float(kline['l']),
-                        'close': float(kline['c']),
-                        'volume': float(kline['v']),
-                        'is_closed': kline['x'],
-                        'interval': self.interval,
-                        'exchange': 'BINANCE'
-                    }
+                kline = _decode_kline(message)
+                if kline is None:
+                    continue
                     
-                    await self._notify_callbacks(candle_data)
+                symbol, open_time, o, h, l, c, v, is_closed = kline
+                if not is_closed and not self.emit_ticks:
+                    continue
+                
+                candle_data = {
+                    'symbol': symbol,
+                    'timestamp': open_time,  # Open time, epoch ms
+                    'open': o,
+                    'high': h,
+                    'low': l,
+                    'close': c,
+                    'volume': v,
+                    'is_closed': is_closed,
+                    'interval': self.interval,
+                    'exchange': 'BINANCE'
+                }
+                
+                self.queue.put_nowait(candle_data)
                         
         except websockets.exceptions.ConnectionClosed:
             logger.warning("Binance WebSocket connection closed")
-            self.running = False
         except Exception as e:
             logger.error(f"Error in Binance WebSocket listener: {e}")
-            self.running = False
+            
+    async def _dispatch(self):
+        """Forward queued candles to callbacks, merging bursts into one batch"""
+        while True:
+            batch = [await self.queue.get()]
+            while not self.queue.empty() and len(batch) < BATCH_MAX:
+                batch.append(self.queue.get_nowait())
+            await self._notify_callbacks_batch(batch)
+            
+    async def _stop_dispatch(self):
+        """Cancel the dispatch task"""
+        if self.dispatch_task:
+            self.dispatch_task.cancel()
+            try:
+                await self.dispatch_task
+            except asyncio.CancelledError:
+                pass
+            self.dispatch_task = None
             
     async def close(self):
         """Close WebSocket connection"""
         self.running = False
         if self.websocket:
             await self.websocket.close()
+            await self._stop_dispatch()
             logger.info("Binance WebSocket closed")
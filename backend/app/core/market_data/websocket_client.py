@@ -5,7 +5,10 @@ Manages connections to multiple exchanges and normalizes data streams
 
 import asyncio
 import logging
-from typing import Dict, Callable, Optional, List
+import re
+from typing import Dict, Callable, Optional, List, Tuple
+
+import numpy as np
 
 from app.core.market_data.exchanges.binance import BinanceWebSocket
 from app.core.market_data.exchanges.alpaca import AlpacaWebSocket
@@ -13,6 +16,94 @@ from app.core.market_data.exchanges.polygon import PolygonWebSocket
 
 logger = logging.getLogger(__name__)
 
+SUBSCRIBER_QUEUE_SIZE = 1000
+
+# Symbols routed to Binance (e.g. BTCUSDT, ETHBTC); everything else goes to Alpaca
+_CRYPTO_PATTERN = re.compile(r"USDT|BTC")
+RING_CAPACITY = 4096
+
+class SymbolRing:
+    """
+    Fixed-capacity columnar OHLCV history for one symbol
+    
+    Updates for the candle in progress overwrite its slot; a new open time
+    advances to the next slot, wrapping once the buffer is full.
+    """
+    
+    __slots__ = ('ts', 'o', 'h', 'l', 'c', 'v', 'idx', 'cap', 'size', 'is_closed', 'interval', 'exchange')
+    
+    def __init__(self, cap: int = RING_CAPACITY):
+        self.cap = cap
+        self.ts = np.zeros(cap, dtype=np.int64)  # Epoch ms
+        self.o = np.zeros(cap)
+        self.h = np.zeros(cap)
+        self.l = np.zeros(cap)
+        self.c = np.zeros(cap)
+        self.v = np.zeros(cap)
+        self.idx = 0  # Next slot to write
+        self.size = 0
+        self.is_closed = False
+        self.interval = None
+        self.exchange = None
+        
+    def push(self, data: Dict):
+        """Write one update into the buffer"""
+        ts = data['timestamp']
+        last = self.idx - 1
+        if self.size and self.ts[last] == ts:
+            slot = last % self.cap
+        else:
+            slot = self.idx
+            self.idx = (self.idx + 1) % self.cap
+            self.size = min(self.size + 1, self.cap)
+            
+        self.ts[slot] = ts
+        self.o[slot] = data['open']
+        self.h[slot] = data['high']
+        self.l[slot] = data['low']
+        self.c[slot] = data['close']
+        self.v[slot] = data['volume']
+        self.is_closed = data.get('is_closed', False)
+        self.interval = data.get('interval')
+        self.exchange = data.get('exchange')
+        
+    def tail(self, field: str, window: int) -> np.ndarray:
+        """Last `window` values of a column in chronological order"""
+        column = getattr(self, field)
+        n = min(window, self.size)
+        start = self.idx - n
+        if start >= 0:
+            return column[start:self.idx]
+        return np.concatenate((column[start:], column[:self.idx]))
+        
+    def ohlc(self, window: int) -> Dict[str, np.ndarray]:
+        """Last `window` bars as time (epoch ms) and open/high/low/close arrays"""
+        return {
+            'time': self.tail('ts', window),
+            'open': self.tail('o', window),
+            'high': self.tail('h', window),
+            'low': self.tail('l', window),
+            'close': self.tail('c', window)
+        }
+        
+    def latest(self) -> Optional[Dict]:
+        """Most recent update as a candle dict"""
+        if not self.size:
+            return None
+        i = self.idx - 1
+        return {
+            'timestamp': int(self.ts[i]),
+            'open': float(self.o[i]),
+            'high': float(self.h[i]),
+            'low': float(self.l[i]),
+            'close': float(self.c[i]),
+            'volume': float(self.v[i]),
+            'is_closed': self.is_closed,
+            'interval': self.interval,
+            'exchange': self.exchange
+        }
+
+
 class MarketDataEngine:
     """
     Central engine for managing market data feeds from multiple sources
@@ -20,8 +111,11 @@ class MarketDataEngine:
     
     def __init__(self):
         self.exchanges = {}
-        self.data_cache = {}
+        self.rings: Dict[str, SymbolRing] = {}
         self.subscribers = []
+        self._subs_snapshot: Tuple[Callable, ...] = ()
+        self._queues: List[asyncio.Queue] = []
+        self._workers: List[asyncio.Task] = []
         self.running = False
         
     async def start(self, symbols: List[str], interval: str = "1m"):
@@ -30,11 +124,15 @@ class MarketDataEngine:
         """
         logger.info(f"🚀 Starting Market Data Engine for {len(symbols)} symbols")
         self.running = True
+        for callback in self.subscribers[len(self._workers):]:
+            self._start_worker(callback)
         
         # Determine which exchange to use based on symbol format or config
         # For now, default to Binance for crypto pairs (e.g., BTCUSDT)
-        crypto_symbols = [s for s in symbols if "USDT" in s or "BTC" in s]
-        stock_symbols = [s for s in symbols if s not in crypto_symbols]
+        crypto_symbols = []
+        stock_symbols = []
+        for s in symbols:
+            (crypto_symbols if _CRYPTO_PATTERN.search(s) else stock_symbols).append(s)
         
         tasks = []
         
@@ -57,36 +155,84 @@ class MarketDataEngine:
         # Run connections concurrently
         await asyncio.gather(*tasks)
         
-    async def _handle_market_data(self, data: Dict):
+    async def _handle_market_data(self, updates: List[Dict]):
         """
-        normalize and distribute incoming data from any exchange
+        normalize and distribute a batch of incoming data from any exchange
         """
-        symbol = data['symbol']
+        for data in updates:
+            symbol = data['symbol']
+            
+            # Update cache
+            ring = self.rings.get(symbol)
+            if ring is None:
+                ring = self.rings[symbol] = SymbolRing()
+            ring.push(data)
+            
+            # Log significant updates (e.g. candle close)
+            if data.get('is_closed'):
+                logger.info(
+                    f"📊 {symbol} [{data.get('exchange', 'UNKNOWN')}] Closed - "
+                    f"C: {data['close']}"
+                )
         
-        # Update cache
-        self.data_cache[symbol] = data
+        # Notify subscribers
+        if self._queues:
+            for queue in self._queues:
+                for data in updates:
+                    if queue.full():
+                        queue.get_nowait()  # Drop the stalest tick rather than block the feed
+                        logger.warning("Subscriber queue full, dropping oldest update")
+                    queue.put_nowait(data)
+            return
         
-        # Log significant updates (e.g. candle close)
-        if data.get('is_closed'):
-            logger.info(
-                f"📊 {symbol} [{data.get('exchange', 'UNKNOWN')}] Closed - "
-                f"C: {data['close']}"
+        subs = self._subs_snapshot
+        for data in updates:
+            results = await asyncio.gather(
+                *(subscriber(data) for subscriber in subs),
+                return_exceptions=True
             )
-        
-        # Notify subscribers
-        for subscriber in self.subscribers:
-            try:
-                await subscriber(data)
-            except Exception as e:
-                logger.error(f"Error in subscriber callback: {e}")
+            for result in results:
+                if isinstance(result, Exception):
+                    logger.error(f"Error in subscriber callback: {result}")
             
     def subscribe(self, callback: Callable):
         """Subscribe to unified market data stream"""
         self.subscribers.append(callback)
+        self._subs_snapshot = tuple(self.subscribers)
+        if self.running:
+            self._start_worker(callback)
+    
+    def _start_worker(self, callback: Callable):
+        """Give a subscriber its own queue so a slow consumer can't stall the feed"""
+        queue: asyncio.Queue = asyncio.Queue(maxsize=SUBSCRIBER_QUEUE_SIZE)
+        self._queues.append(queue)
+        self._workers.append(asyncio.create_task(self._subscriber_worker(callback, queue)))
+    
+    async def _subscriber_worker(self, callback: Callable, queue: asyncio.Queue):
+        """Deliver queued updates to one subscriber in order"""
+        while True:
+            data = await queue.get()
+            try:
+                await callback(data)
+            except Exception as e:
+                logger.error(f"Error in subscriber callback: {e}")
         
     def get_latest(self, symbol: str) -> Optional[Dict]:
         """Get latest cached data"""
-        return self.data_cache.get(symbol.upper())
+        ring = self.rings.get(symbol.upper())
+        if ring is None:
+            return None
+        latest = ring.latest()
+        if latest is not None:
+            latest['symbol'] = symbol.upper()
+        return latest
+        
+    def get_ohlc(self, symbol: str, window: int) -> Optional[Dict[str, np.ndarray]]:
+        """Get the last `window` cached bars as bar time and OHLC arrays"""
+        ring = self.rings.get(symbol.upper())
+        if ring is None or not ring.size:
+            return None
+        return ring.ohlc(window)
         
     async def stop(self):
         """Stop all exchange connections"""
@@ -94,6 +240,11 @@ class MarketDataEngine:
         for name, exchange in self.exchanges.items():
             logger.info(f"Stopping {name} connection...")
             await exchange.close()
+        for worker in self._workers:
+            worker.cancel()
+        await asyncio.gather(*self._workers, return_exceptions=True)
+        self._workers.clear()
+        self._queues.clear()
         logger.info("🛑 Market Data Engine stopped")
 
 
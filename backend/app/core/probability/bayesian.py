@@ -1,12 +1,17 @@
 """Bayesian Probability Engine"""
 
-import numpy as np
+from math import sqrt
 from typing import Dict, Any
 from decimal import Decimal
 import logging
 
+import numpy as np
+
 logger = logging.getLogger(__name__)
 
+# Z-score for each supported confidence level
+_Z_SCORES = {0.90: 1.645, 0.95: 1.96, 0.99: 2.576}
+
 
 class BayesianProbability:
     """Bayesian probability calculator for signal confidence"""
@@ -73,6 +78,34 @@ class BayesianProbability:
             logger.error(f"Bayesian calculation error: {e}")
             return prior_win_rate  # Fallback to prior
     
+    @staticmethod
+    def calculate_posterior_batch(
+        prior_win_rates: np.ndarray,
+        likelihoods_success: np.ndarray,
+        likelihoods_failure: np.ndarray
+    ) -> np.ndarray:
+        """
+        Vectorized calculate_posterior_probability over many candidates.
+        
+        Args:
+            prior_win_rates: Historical win rates (0-100)
+            likelihoods_success: P(Conditions|Success) per candidate
+            likelihoods_failure: P(Conditions|Failure) per candidate
+        
+        Returns:
+            Posterior probabilities (0-100); the prior where P(Conditions) is 0
+        """
+        priors = np.asarray(prior_win_rates, dtype=np.float64)
+        p_success = priors / 100.0
+        joint = likelihoods_success * p_success
+        p_conditions = joint + likelihoods_failure * (1.0 - p_success)
+        
+        with np.errstate(divide='ignore', invalid='ignore'):
+            posterior = joint / p_conditions * 100.0
+        
+        posterior = np.where(p_conditions == 0, priors, posterior)
+        return np.clip(posterior, 0.0, 100.0)
+    
     @staticmethod
     def _calculate_likelihood(
         current_conditions: Dict[str, Any],
@@ -131,11 +164,10 @@ class BayesianProbability:
         n = total_trades
         
         # Z-score for confidence level
-        z_scores = {0.90: 1.645, 0.95: 1.96, 0.99: 2.576}
-        z = z_scores.get(confidence_level, 1.96)
+        z = _Z_SCORES.get(confidence_level, 1.96)
         
         # Standard error
-        se = np.sqrt((p * (1 - p)) / n)
+        se = sqrt((p * (1 - p)) / n)
         
         # Confidence interval
         lower = max(0.0, p - z * se)
@@ -1,7 +1,7 @@
 
 import numpy as np
 import pandas as pd
-from typing import Dict, List, Optional
+from typing import Any, Dict, List, Optional, Tuple
 from datetime import datetime
 import logging
 
@@ -13,25 +13,62 @@ class MarketRegimeDetector:
     Used to adjust strategy probability scores
     """
     
+    CACHE_SIZE = 1024
+    
+    def __init__(self):
+        # (symbol, last bar time, bar count, last close) -> regime, FIFO-evicted
+        self._cache: Dict[Tuple[Any, Any, int, float], Dict] = {}
+    
     def detect_regime(self, market_data: pd.DataFrame) -> Dict:
         """
         Detect market regime from OHLCV data
+        
+        Results are memoized per latest bar, so repeated calls within one
+        candle interval skip the computation.
         """
         if market_data.empty or len(market_data) < 20:
             return {'regime': 'unknown', 'volatility': 'unknown'}
-            
+        
+        key = self._cache_key(market_data)
+        cached = self._cache.get(key)
+        if cached is not None:
+            return dict(cached)
+        
+        regime = self._detect_regime(market_data)
+        if regime['regime'] != 'error':
+            if len(self._cache) >= self.CACHE_SIZE:
+                del self._cache[next(iter(self._cache))]
+            self._cache[key] = regime
+        return dict(regime)
+    
+    @staticmethod
+    def _cache_key(market_data: pd.DataFrame) -> Tuple[Any, Any, int, float]:
+        """Identify a series by its symbol and latest bar"""
+        symbol = market_data['symbol'].iat[-1] if 'symbol' in market_data.columns else None
+        last_time = market_data['time'].iat[-1] if 'time' in market_data.columns else market_data.index[-1]
+        return (symbol, last_time, len(market_data), float(market_data['close'].iat[-1]))
+    
+    def _detect_regime(self, market_data: pd.DataFrame) -> Dict:
+        """Compute regime from the latest ATR and SMA values"""
         try:
+            # Only the latest ATR/SMA values are needed, so work on the tail
+            # windows of the raw arrays instead of full rolling Series
+            high = market_data['high'].to_numpy(dtype=np.float64)[-14:]
+            low = market_data['low'].to_numpy(dtype=np.float64)[-14:]
+            close = market_data['close'].to_numpy(dtype=np.float64)
+            prev_close = close[-15:-1]
+            
             # Calculate ATR (Average True Range) for volatility
-            high_low = market_data['high'] - market_data['low']
-            high_close = np.abs(market_data['high'] - market_data['close'].shift())
-            low_close = np.abs(market_data['low'] - market_data['close'].shift())
-            tr = pd.concat([high_low, high_close, low_close], axis=1).max(axis=1)
-            atr = tr.rolling(window=14).mean().iloc[-1]
+            tr = np.maximum.reduce([
+                high - low,
+                np.abs(high - prev_close),
+                np.abs(low - prev_close)
+            ])
+            atr = tr.mean()
             
             # fast/slow MA for trend
-            close = market_data['close']
-            sma_20 = close.rolling(window=20).mean().iloc[-1]
-            sma_50 = close.rolling(window=50).mean().iloc[-1]
+            sma_20 = close[-20:].mean()
+            sma_50 = close[-50:].mean() if len(close) >= 50 else np.nan
             
             # ADX simplified (Directional Movement)
             # Real ADX is complex, using simplified trend strength here
@@ -3,16 +3,71 @@
 import numpy as np
 from typing import Dict, List, Tuple
 from app.config import settings
+from app.utils.jit import HAS_NUMBA, njit, prange
 import logging
 
 logger = logging.getLogger(__name__)
 
 
+@njit(cache=True, fastmath=True, parallel=True)
+def _mc_kernel(
+    n_sims: int,
+    n_trades: int,
+    p_win: float,
+    win_mult: float,
+    loss_mult: float,
+    initial: float
+) -> np.ndarray:
+    """
+    Simulate compounding trade paths in parallel, stopping each at ruin
+    
+    Returns:
+        Final capital per simulated path
+    """
+    final_capitals = np.empty(n_sims)
+    for sim in prange(n_sims):
+        capital = initial
+        for _ in range(n_trades):
+            capital *= win_mult if np.random.random() < p_win else loss_mult
+            if capital <= 0:
+                capital = 0.0
+                break
+        final_capitals[sim] = capital
+    return final_capitals
+
+
+@njit(cache=True, fastmath=True, parallel=True)
+def _mc_profit_kernel(
+    n_sims: int,
+    n_trades: int,
+    p_win: float,
+    win_mult: float,
+    loss_mult: float
+) -> int:
+    """
+    Count simulated paths that end in profit, without storing final capitals
+    
+    Capital compounds multiplicatively, so paths are tracked as growth from 1.0.
+    """
+    profitable = 0
+    for sim in prange(n_sims):
+        growth = 1.0
+        for _ in range(n_trades):
+            growth *= win_mult if np.random.random() < p_win else loss_mult
+            if growth <= 0:
+                growth = 0.0
+                break
+        if growth > 1.0:
+            profitable += 1
+    return profitable
+
+
 class MonteCarloSimulator:
     """Monte Carlo simulation for strategy performance prediction"""
     
     def __init__(self, n_simulations: int = None):
         self.n_simulations = n_simulations or settings.MONTE_CARLO_SIMULATIONS
+        self._rng = np.random.default_rng()
     
     def simulate_strategy_performance(
         self,
@@ -39,32 +94,13 @@ class MonteCarloSimulator:
             # Convert win rate to probability
             p_win = win_rate / 100.0
             
-            # Run simulations
-            final_capitals = []
+            # Each trade scales capital by a fixed factor for a win or a loss
+            win_mult = 1.0 + avg_win / 100.0
+            loss_mult = 1.0 + avg_loss / 100.0
             
-            for _ in range(self.n_simulations):
-                capital = initial_capital
-                
-                for _ in range(n_trades):
-                    # Generate random trade outcome
-                    if np.random.random() < p_win:
-                        # Winning trade
-                        profit = capital * (avg_win / 100.0)
-                    else:
-                        # Losing trade
-                        profit = capital * (avg_loss / 100.0)
-                    
-                    capital += profit
-                    
-                    # Check for ruin
-                    if capital <= 0:
-                        capital = 0
-                        break
-                
-                final_capitals.append(capital)
-            
-            # Calculate statistics
-            final_capitals = np.array(final_capitals)
+            final_capitals = self._simulate_final_capitals(
+                p_win, win_mult, loss_mult, n_trades, float(initial_capital)
+            )
             
             # Probability of profit
             prob_profit = np.sum(final_capitals > initial_capital) / self.n_simulations * 100
@@ -100,6 +136,60 @@ class MonteCarloSimulator:
                 "error": str(e)
             }
     
+    def probability_of_profit(
+        self,
+        win_rate: float,
+        avg_win: float,
+        avg_loss: float,
+        n_trades: int = 100
+    ) -> float:
+        """
+        Probability (0-100) that a run of n_trades ends in profit.
+        
+        Same simulation as simulate_strategy_performance, without the
+        distribution statistics; used on the signal generation path.
+        """
+        try:
+            p_win = win_rate / 100.0
+            win_mult = 1.0 + avg_win / 100.0
+            loss_mult = 1.0 + avg_loss / 100.0
+            
+            if HAS_NUMBA:
+                profitable = _mc_profit_kernel(self.n_simulations, n_trades, p_win, win_mult, loss_mult)
+            else:
+                final_capitals = self._simulate_final_capitals(p_win, win_mult, loss_mult, n_trades, 1.0)
+                profitable = np.count_nonzero(final_capitals > 1.0)
+            
+            return round(profitable / self.n_simulations * 100, 2)
+            
+        except Exception as e:
+            logger.error(f"Monte Carlo simulation error: {e}")
+            return 50.0
+    
+    def _simulate_final_capitals(
+        self,
+        p_win: float,
+        win_mult: float,
+        loss_mult: float,
+        n_trades: int,
+        initial_capital: float
+    ) -> np.ndarray:
+        """Final capital of each simulated path"""
+        if HAS_NUMBA:
+            # Compiled path loop: parallel over simulations, exits early on ruin
+            return _mc_kernel(
+                self.n_simulations, n_trades, p_win, win_mult, loss_mult, initial_capital
+            )
+        
+        # Run all simulations at once: one row of trade outcomes per path
+        wins = self._rng.random((self.n_simulations, n_trades)) < p_win
+        factors = np.where(wins, win_mult, loss_mult)
+        final_capitals = initial_capital * np.prod(factors, axis=1)
+        
+        # Ruin: a non-positive factor wipes the account and the path stops at 0
+        final_capitals[(factors <= 0).any(axis=1)] = 0.0
+        return final_capitals
+    
     def simulate_single_trade_outcome(
         self,
         win_rate: float,
@@ -119,17 +209,8 @@ class MonteCarloSimulator:
         """
         p_win = win_rate / 100.0
         
-        # Simulate outcomes
-        outcomes = []
-        for _ in range(n_simulations):
-            if np.random.random() < p_win:
-                # Win: positive return
-                outcomes.append(risk_reward_ratio)
-            else:
-                # Loss: -1R
-                outcomes.append(-1.0)
-        
-        outcomes = np.array(outcomes)
+        # Simulate outcomes: win pays risk_reward_ratio R, loss costs 1R
+        outcomes = np.where(self._rng.random(n_simulations) < p_win, risk_reward_ratio, -1.0)
         
         # Expected value (in R multiples)
         expected_value = np.mean(outcomes)
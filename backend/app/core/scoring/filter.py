@@ -1,6 +1,8 @@
 
 from typing import Dict, Optional
 
+import numpy as np
+
 class SignalQualityFilter:
     """
     Filters signals based on quality thresholds
@@ -17,9 +19,16 @@ class SignalQualityFilter:
         if not signal:
             return False
             
-        score = signal.get('signal_score', 0)
-        prob = signal.get('probability_score', 0)
+        score = signal.get('signal_score') or 0.0
+        if score < self.min_score:
+            return False
         
-        return score >= self.min_score and prob >= self.min_probability
+        return (signal.get('probability_score') or 0.0) >= self.min_probability
+    
+    def validate_batch(self, scores: np.ndarray, probabilities: np.ndarray) -> np.ndarray:
+        """
+        Check many signals at once; returns a boolean mask of those that pass
+        """
+        return (np.asarray(scores) >= self.min_score) & (np.asarray(probabilities) >= self.min_probability)
 
 signal_filter = SignalQualityFilter()
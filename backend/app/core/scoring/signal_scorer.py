@@ -1,11 +1,35 @@
 """Multi-Factor Signal Scoring Engine"""
 
-from typing import Dict, Any
+from typing import Dict, Any, Sequence
 from decimal import Decimal
 import logging
 
+import numpy as np
+
 logger = logging.getLogger(__name__)
 
+# Volatility levels, ordered low to high
+_VOL_INDEX = {"very_low": 0, "low": 1, "normal": 2, "high": 3, "very_high": 4}
+_VOL_NORMAL = _VOL_INDEX["normal"]
+
+# Volatility match factor [current, optimal]: perfect 10, adjacent 7, two apart 5, else 3
+_VOL_TABLE = np.array([
+    [10, 7, 5, 3, 3],
+    [7, 10, 7, 5, 3],
+    [5, 7, 10, 7, 5],
+    [3, 5, 7, 10, 7],
+    [3, 3, 5, 7, 10],
+], dtype=np.float32)
+_VOL_ROWS = _VOL_TABLE.tolist()  # Plain floats for the scalar path
+
+# Risk/reward bands as (threshold, base, slope); sweet spot is 2-4
+# 1:1 = 3.0, 2:1 = 7.0, 3:1+ = 10.0, below 1:1 scales 0-3
+_RR_LUT = (
+    (3.0, 10.0, 0.0),
+    (2.0, 7.0, 3.0),
+    (1.0, 3.0, 4.0),
+)
+
 
 class SignalScorer:
     """
@@ -14,6 +38,15 @@ class SignalScorer:
     Combines multiple factors to produce a signal quality score (0-10).
     """
     
+    # Factor order used by the batch scorer
+    FACTORS = (
+        "probability_score",
+        "backtest_performance",
+        "market_regime_match",
+        "risk_reward_ratio",
+        "volatility_match",
+    )
+    
     # Default weights for scoring factors
     WEIGHTS = {
         "probability_score": 0.35,      # 35% - Direct probability
@@ -37,6 +70,7 @@ class SignalScorer:
             self.weights = weights
         else:
             self.weights = self.WEIGHTS
+        self._weight_vector = np.array([self.weights[name] for name in self.FACTORS])
     
     def calculate_signal_score(
         self,
@@ -67,38 +101,41 @@ class SignalScorer:
             # Factor 1: Probability Score (normalized to 0-10)
             prob_factor = (probability_score / 100.0) * 10.0
             
-            # Factor 2: Backtest Performance (normalized 0-10)
-            perf_factor = self._calculate_performance_factor(backtest_metrics)
+            # Factor 2: Backtest Performance (average of win rate and Sharpe 0-3, 0-10)
+            win_rate = float(backtest_metrics.get("win_rate", 50.0))
+            sharpe = float(backtest_metrics.get("sharpe_ratio", 0.0))
+            perf_factor = ((win_rate / 10.0) + min(sharpe / 3.0, 1.0) * 10.0) / 2.0
+            perf_factor = max(0.0, min(10.0, perf_factor))
             
-            # Factor 3: Market Regime Match (0-10)
-            regime_factor = self._calculate_regime_factor(
-                market_regime,
-                strategy_regime_performance
-            )
+            # Factor 3: Market Regime Match (strategy win rate in regime, 0-10)
+            regime_factor = strategy_regime_performance.get(market_regime, 50.0) / 10.0
+            regime_factor = max(0.0, min(10.0, regime_factor))
             
             # Factor 4: Risk/Reward Ratio (normalized 0-10)
-            rr_factor = self._calculate_risk_reward_factor(risk_reward_ratio)
+            for threshold, base, slope in _RR_LUT:
+                if risk_reward_ratio >= threshold:
+                    rr_factor = base + (risk_reward_ratio - threshold) * slope
+                    break
+            else:
+                rr_factor = max(0.0, risk_reward_ratio * 3.0)
             
-            # Factor 5: Volatility Match (0-10)
-            vol_factor = self._calculate_volatility_factor(
-                current_volatility,
-                optimal_volatility
-            )
+            # Factor 5: Volatility Match (0-10), unknown levels count as normal
+            vol_factor = _VOL_ROWS[_VOL_INDEX.get(current_volatility, _VOL_NORMAL)][
+                _VOL_INDEX.get(optimal_volatility, _VOL_NORMAL)
+            ]
             
             # Weighted sum
+            weights = self.weights
             score = (
-                prob_factor * self.weights["probability_score"] +
-                perf_factor * self.weights["backtest_performance"] +
-                regime_factor * self.weights["market_regime_match"] +
-                rr_factor * self.weights["risk_reward_ratio"] +
-                vol_factor * self.weights["volatility_match"]
+                prob_factor * weights["probability_score"] +
+                perf_factor * weights["backtest_performance"] +
+                regime_factor * weights["market_regime_match"] +
+                rr_factor * weights["risk_reward_ratio"] +
+                vol_factor * weights["volatility_match"]
             )
             
-            # Final score multiplied by 10 to get 0-10 scale
-            final_score = score
-            
             # Clamp to valid range
-            final_score = max(0.0, min(10.0, final_score))
+            final_score = max(0.0, min(10.0, score))
             
             logger.debug(
                 f"Signal score calculated: {final_score:.2f} "
@@ -112,104 +149,52 @@ class SignalScorer:
             logger.error(f"Signal scoring error: {e}")
             return 5.0  # Return neutral score on error
     
-    def _calculate_performance_factor(self, metrics: Dict[str, Any]) -> float:
-        """Calculate performance factor from backtest metrics (0-10)"""
-        try:
-            win_rate = float(metrics.get("win_rate", 50.0))
-            sharpe = float(metrics.get("sharpe_ratio", 0.0))
-            
-            # Normalize win rate (50% = 5.0, 100% = 10.0)
-            win_component = (win_rate / 100.0) * 10.0
-            
-            # Normalize Sharpe (0-3 range, where 3+ is excellent)
-            sharpe_component = min(sharpe / 3.0, 1.0) * 10.0
-            
-            # Average the two components
-            performance = (win_component + sharpe_component) / 2.0
-            
-            return max(0.0, min(10.0, performance))
-            
-        except Exception as e:
-            logger.error(f"Performance factor error: {e}")
-            return 5.0
-    
-    def _calculate_regime_factor(
+    def calculate_signal_scores_batch(
         self,
-        current_regime: str,
-        regime_performance: Dict[str, float]
-    ) -> float:
-        """Calculate regime compatibility factor (0-10)"""
-        try:
-            # Get strategy's win rate in current regime
-            regime_win_rate = regime_performance.get(current_regime, 50.0)
-            
-            # Normalize to 0-10 scale
-            factor = (regime_win_rate / 100.0) * 10.0
-            
-            return max(0.0, min(10.0, factor))
-            
-        except Exception as e:
-            logger.error(f"Regime factor error: {e}")
-            return 5.0
-    
-    def _calculate_risk_reward_factor(self, rr_ratio: float) -> float:
-        """Calculate risk/reward factor (0-10)"""
-        try:
-            # Risk/reward sweet spot is 2-4
-            # 1:1 = 3.0
-            # 2:1 = 7.0
-            # 3:1 = 10.0
-            # 4:1+ = 10.0
-            
-            if rr_ratio >= 3.0:
-                return 10.0
-            elif rr_ratio >= 2.0:
-                return 7.0 + ((rr_ratio - 2.0) * 3.0)  # Scale 7-10
-            elif rr_ratio >= 1.0:
-                return 3.0 + ((rr_ratio - 1.0) * 4.0)  # Scale 3-7
-            else:
-                return max(0.0, rr_ratio * 3.0)  # Scale 0-3
-                
-        except Exception as e:
-            logger.error(f"Risk/reward factor error: {e}")
-            return 5.0
-    
-    def _calculate_volatility_factor(
-        self,
-        current: str,
-        optimal: str
-    ) -> float:
-        """Calculate volatility match factor (0-10)"""
-        try:
-            # Perfect match = 10
-            # Adjacent = 7
-            # Opposite = 3
-            
-            volatility_scale = {
-                "very_low": 1,
-                "low": 2,
-                "normal": 3,
-                "high": 4,
-                "very_high": 5
-            }
-            
-            current_level = volatility_scale.get(current, 3)
-            optimal_level = volatility_scale.get(optimal, 3)
-            
-            difference = abs(current_level - optimal_level)
-            
-            if difference == 0:
-                return 10.0
-            elif difference == 1:
-                return 7.0
-            elif difference == 2:
-                return 5.0
-            else:
-                return 3.0
-                
-        except Exception as e:
-            logger.error(f"Volatility factor error: {e}")
-            return 5.0
+        probability_scores: np.ndarray,
+        win_rates: np.ndarray,
+        sharpe_ratios: np.ndarray,
+        regime_win_rates: np.ndarray,
+        risk_reward_ratios: np.ndarray,
+        current_volatilities: Sequence[str],
+        optimal_volatilities: Sequence[str]
+    ) -> np.ndarray:
+        """
+        Score many signals at once; same factors as calculate_signal_score.
+        
+        Args:
+            probability_scores: Probability scores (0-100)
+            win_rates: Backtest win rates (0-100)
+            sharpe_ratios: Backtest Sharpe ratios
+            regime_win_rates: Strategy win rate in the current regime (0-100)
+            risk_reward_ratios: Reward/Risk ratios
+            current_volatilities: Current volatility levels
+            optimal_volatilities: Strategies' optimal volatility levels
+        
+        Returns:
+            Signal scores (0-10), one per signal
+        """
+        prob = np.asarray(probability_scores, dtype=np.float64)
+        win_rate = np.asarray(win_rates, dtype=np.float64)
+        sharpe = np.asarray(sharpe_ratios, dtype=np.float64)
+        regime = np.asarray(regime_win_rates, dtype=np.float64)
+        rr = np.asarray(risk_reward_ratios, dtype=np.float64)
+        
+        current = np.fromiter((_VOL_INDEX.get(v, _VOL_NORMAL) for v in current_volatilities), dtype=np.int8)
+        optimal = np.fromiter((_VOL_INDEX.get(v, _VOL_NORMAL) for v in optimal_volatilities), dtype=np.int8)
+        
+        factors = np.empty((len(prob), len(self.FACTORS)))
+        factors[:, 0] = prob / 10.0
+        factors[:, 1] = np.clip((win_rate / 10.0 + np.minimum(sharpe / 3.0, 1.0) * 10.0) / 2.0, 0.0, 10.0)
+        factors[:, 2] = np.clip(regime / 10.0, 0.0, 10.0)
+        factors[:, 3] = np.select(
+            [rr >= 3.0, rr >= 2.0, rr >= 1.0],
+            [10.0, 7.0 + (rr - 2.0) * 3.0, 3.0 + (rr - 1.0) * 4.0],
+            default=np.maximum(rr * 3.0, 0.0)
+        )
+        factors[:, 4] = _VOL_TABLE[current, optimal]
+        
+        return np.round(np.clip(factors @ self._weight_vector, 0.0, 10.0), 1)
 
 
 # Export instance
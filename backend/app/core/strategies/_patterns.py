@@ -0,0 +1,65 @@
+"""
+Price Action Pattern Kernels
+Compiled checks over recent OHLC arrays (oldest bar first, current bar last)
+"""
+
+import numpy as np
+
+from app.utils.jit import njit
+
+
+@njit(cache=True)
+def liquidity_sweep(high: np.ndarray, low: np.ndarray, close: np.ndarray, lookback: int) -> bool:
+    """
+    Bullish sweep: the current bar trades below the lowest low of the
+    previous `lookback` bars and closes back above it
+    """
+    n = low.shape[0]
+    if lookback < 1 or n < lookback + 1:
+        return False
+
+    prev_low = low[n - lookback - 1]
+    for i in range(n - lookback, n - 1):
+        if low[i] < prev_low:
+            prev_low = low[i]
+
+    return low[n - 1] < prev_low and close[n - 1] > prev_low
+
+
+@njit(cache=True)
+def order_block(
+    open_: np.ndarray,
+    high: np.ndarray,
+    low: np.ndarray,
+    close: np.ndarray,
+    lookback: int
+) -> bool:
+    """
+    Bullish order block mitigation
+
+    The block is the newest bearish bar within `lookback` bars that a later
+    bar closed above. The current bar mitigates it by trading back into the
+    block's range while closing above its low.
+    """
+    n = close.shape[0]
+    if lookback < 2 or n < lookback + 1:
+        return False
+
+    last = n - 1
+    # At least one displacement bar must sit between the block and the current bar
+    for i in range(last - 2, last - lookback - 1, -1):
+        if close[i] >= open_[i]:
+            continue
+
+        top = high[i]
+        displaced = False
+        for j in range(i + 1, last):
+            if close[j] > top:
+                displaced = True
+                break
+        if not displaced:
+            continue
+
+        return low[last] <= top and close[last] > low[i]
+
+    return False
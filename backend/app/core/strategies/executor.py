@@ -3,12 +3,124 @@ Strategy Executor
 Executes parsed strategies against market data
 """
 
+import hashlib
 import logging
-from typing import Dict, List, Optional
+import time
+from dataclasses import dataclass, field
+from typing import Any, Callable, Dict, List, Optional, Tuple, Union
 from datetime import datetime
 
+import numpy as np
+import orjson
+
+from app.core.strategies._patterns import liquidity_sweep, order_block
+
 logger = logging.getLogger(__name__)
 
+# Trading sessions as UTC hour windows [start, end)
+SESSIONS = {
+    'london': (7, 16),
+    'new_york': (13, 22),
+    'asia': (0, 9)
+}
+
+# Bit h is set iff UTC hour h falls in the session; unknown sessions allow every hour
+SESSION_MASKS = {name: sum(1 << h for h in range(start, end)) for name, (start, end) in SESSIONS.items()}
+ALL_HOURS = (1 << 24) - 1
+
+# Default RSI thresholds by rule mode
+RSI_DEFAULTS = {'oversold': 30, 'overbought': 70}
+
+
+
+@dataclass(slots=True, frozen=True)
+class MarketSnapshot:
+    """Market data for one tick, built once and shared by every rule"""
+    symbol: str
+    close: Optional[float]
+    rsi: Optional[float] = None
+    ema: Dict[int, float] = field(default_factory=dict)  # period -> value
+    ohlc: Optional[Dict[str, np.ndarray]] = None  # Recent bars, oldest first
+    
+    @classmethod
+    def from_market_data(
+        cls,
+        market_data: Dict,
+        ohlc: Optional[Dict[str, np.ndarray]] = None
+    ) -> "MarketSnapshot":
+        """
+        Build from a candle dict with optional 'indicators' and 'ohlc'
+        
+        EMAs are read from the int-keyed indicators['ema'] table as-is; flat
+        'ema_<period>' keys are still accepted and converted.
+        """
+        indicators = market_data.get('indicators') or {}
+        ema = indicators.get('ema')
+        if ema is None:
+            ema = {
+                int(key[4:]): value
+                for key, value in indicators.items()
+                if key.startswith('ema_') and key[4:].isdigit()
+            }
+        return cls(
+            symbol=market_data.get('symbol', 'UNKNOWN'),
+            close=market_data.get('close'),
+            rsi=indicators.get('rsi'),
+            ema=ema,
+            ohlc=ohlc if ohlc is not None else market_data.get('ohlc')
+        )
+
+
+# A compiled rule: market snapshot -> whether the condition holds
+RuleFn = Callable[[MarketSnapshot], bool]
+
+# Rules are timed for their first PROFILE_CALLS calls after each re-sort
+PROFILE_CALLS = 64
+RESORT_EVERY = 1024  # Evaluations between re-sorts
+
+
+def _never(data: MarketSnapshot) -> bool:
+    """Unknown rules never pass"""
+    return False
+
+
+class RuleStats:
+    """Sampled latency and rejection rate of one compiled rule"""
+    
+    __slots__ = ('calls', 'rejects', 'total_ns')
+    
+    def __init__(self):
+        self.calls = 0
+        self.rejects = 0
+        self.total_ns = 0
+        
+    def cost(self) -> float:
+        """Average latency per rejection; unprofiled rules sort first so they get sampled"""
+        if not self.calls:
+            return 0.0
+        return (self.total_ns / self.calls) / max(self.rejects / self.calls, 1e-3)
+
+
+class CompiledRules:
+    """
+    Compiled rules of one strategy, kept cheapest-per-rejection first
+    
+    AND evaluation stops at the first failing rule, so cheap rules that
+    reject most ticks should run before expensive ones.
+    """
+    
+    __slots__ = ('rules', 'evaluations')
+    
+    def __init__(self, rules: List[RuleFn]):
+        self.rules: List[Tuple[RuleFn, RuleStats]] = [(fn, RuleStats()) for fn in rules]
+        self.evaluations = 0
+        
+    def resort(self):
+        """Order rules by sampled cost and start a new sampling window"""
+        self.rules.sort(key=lambda rule: rule[1].cost())
+        self.rules = [(fn, RuleStats()) for fn, _ in self.rules]
+        self.evaluations = 0
+
 
 class StrategyExecutor:
     """
@@ -17,15 +129,18 @@ class StrategyExecutor:
     """
     
     def __init__(self):
-        pass
+        # (strategy id, rules fingerprint) -> compiled rule callables
+        self._compiled: Dict[Tuple[Any, bytes], CompiledRules] = {}
+        # (epoch second the cached hour ends, UTC hour)
+        self._hour_cache: Tuple[float, int] = (0.0, 0)
         
-    def execute(self, strategy: Dict, market_data: Dict) -> Optional[Dict]:
+    def execute(self, strategy: Dict, market_data: Union[MarketSnapshot, Dict]) -> Optional[Dict]:
         """
         Execute a strategy against current market data
         
         Args:
             strategy: Parsed strategy configuration
-            market_data: Current OHLCV and technical data
+            market_data: Snapshot (or candle dict) of current OHLCV and technical data
             
         Returns:
             Signal dictionary (if conditions met) or None
@@ -33,112 +148,146 @@ class StrategyExecutor:
         if not strategy.get('is_active', True):
             return None
             
-        config = strategy.get('config', {})
-        rules = config.get('rules', [])
+        compiled = strategy.get('_compiled_rules')
+        if compiled is None:
+            compiled = self.compile(strategy)
+        
+        if not isinstance(market_data, MarketSnapshot):
+            market_data = MarketSnapshot.from_market_data(market_data)
         
         # 1. Evaluate all rules
-        if not self._evaluate_rules(rules, market_data):
+        if not self._evaluate_rules(compiled, market_data):
             return None
             
         # 2. Generate Signal
         return self._generate_signal(strategy, market_data)
 
-    def _evaluate_rules(self, rules: List[Dict], market_data: Dict) -> bool:
-        """Evaluate list of rules - ALL must pass (AND logic)"""
-        if not rules:
+    def compile(self, strategy: Dict) -> CompiledRules:
+        """
+        Resolve each rule once into a callable with its parameters bound
+        
+        The result is stored on the strategy as '_compiled_rules' and cached
+        by strategy id and rule contents, so reloaded copies reuse it.
+        """
+        rules = strategy.get('config', {}).get('rules', [])
+        fingerprint = hashlib.blake2b(
+            orjson.dumps(rules, option=orjson.OPT_SORT_KEYS, default=str), digest_size=16
+        ).digest()
+        key = (strategy.get('id'), fingerprint)
+        
+        compiled = self._compiled.get(key)
+        if compiled is None:
+            compiled = CompiledRules([self._compile_rule(rule) for rule in rules])
+            self._compiled[key] = compiled
+            
+        strategy['_compiled_rules'] = compiled
+        return compiled
+
+    def _evaluate_rules(self, compiled: CompiledRules, market_data: MarketSnapshot) -> bool:
+        """Evaluate compiled rules - ALL must pass (AND logic)"""
+        if not compiled.rules:
             return False
+        
+        compiled.evaluations += 1
+        if compiled.evaluations >= RESORT_EVERY:
+            compiled.resort()
             
-        for rule in rules:
-            if not self._evaluate_single_rule(rule, market_data):
+        for rule, stats in compiled.rules:
+            if stats.calls < PROFILE_CALLS:
+                start = time.perf_counter_ns()
+                passed = rule(market_data)
+                stats.total_ns += time.perf_counter_ns() - start
+                stats.calls += 1
+                if not passed:
+                    stats.rejects += 1
+            else:
+                passed = rule(market_data)
+            if not passed:
                 return False
         return True
 
-    def _evaluate_single_rule(self, rule: Dict, market_data: Dict) -> bool:
-        """Evaluate a single rule based on its type"""
+    def _compile_rule(self, rule: Dict) -> RuleFn:
+        """Build the callable for a single rule based on its type"""
         rule_type = rule.get('type')
         condition = rule.get('condition')
         params = rule.get('parameters', {})
         
-        # --- Price Action Rules ---
-        if rule_type == 'price_action':
-            if condition == 'liquidity_sweep':
-                return self._check_liquidity_sweep(market_data, params)
-            elif condition == 'order_block':
-                 return self._check_order_block(market_data, params)
-        
-        # --- Technical Indicator Rules ---
-        elif rule_type == 'technical':
-            if condition == 'rsi_oversold':
-                return self._check_rsi(market_data, params, 'oversold')
-            elif condition == 'rsi_overbought':
-                return self._check_rsi(market_data, params, 'overbought')
-            elif condition == 'above_ema':
-                return self._check_above_ema(market_data, params)
-                
         # --- Session Rules ---
-        elif rule_type == 'session':
-            return self._check_session(market_data, condition)
-            
-        return False
+        if rule_type == 'session':
+            mask = SESSION_MASKS.get(condition, ALL_HOURS)
+            return lambda data: bool((mask >> self._current_hour()) & 1)
+        
+        factory = _RULE_FACTORIES.get((rule_type, condition))
+        if factory is None:
+            return _never
+        return factory(self, params)
 
     # --- Rule Implementations ---
     
-    def _check_rsi(self, data: Dict, params: Dict, mode: str) -> bool:
-        """Check RSI condition"""
-        rsi = data.get('indicators', {}).get('rsi')
-        if rsi is None:
-            return False
-            
-        threshold = params.get('threshold', 30 if mode == 'oversold' else 70)
+    def _rsi_rule(self, params: Dict, mode: str) -> RuleFn:
+        """Build RSI condition check"""
+        threshold = params.get('threshold', RSI_DEFAULTS[mode])
         
         if mode == 'oversold':
-            return rsi < threshold
+            def check(data: MarketSnapshot) -> bool:
+                rsi = data.rsi
+                return rsi is not None and rsi < threshold
         else:
-            return rsi > threshold
+            def check(data: MarketSnapshot) -> bool:
+                rsi = data.rsi
+                return rsi is not None and rsi > threshold
+        return check
 
-    def _check_above_ema(self, data: Dict, params: Dict) -> bool:
-        """Check if price is above EMA"""
-        price = data.get('close')
-        ema = data.get('indicators', {}).get(f"ema_{params.get('period', 200)}")
+    def _above_ema_rule(self, params: Dict) -> RuleFn:
+        """Build check for price above EMA"""
+        period = int(params.get('period', 200))
         
-        if price is None or ema is None:
-            return False
-        return price > ema
+        def check(data: MarketSnapshot) -> bool:
+            price = data.close
+            ema = data.ema.get(period)
+            if price is None or ema is None:
+                return False
+            return price > ema
+        return check
 
-    def _check_liquidity_sweep(self, data: Dict, params: Dict) -> bool:
+    def _liquidity_sweep_rule(self, params: Dict) -> RuleFn:
         """
-        Check for liquidity sweep pattern
-        (Price took out previous low/high and closed back inside)
+        Build liquidity sweep check
+        (Price took out the previous lows and closed back inside)
         """
-        # Simplified placeholder logic for now
-        # In production, this would look at recent high/low structure
-        return True  # TODO: Implement real sweep logic
-
-    def _check_order_block(self, data: Dict, params: Dict) -> bool:
-        """Check for order block mitigation"""
-        return True  # TODO: Implement real OB logic
-
-    def _check_session(self, data: Dict, session_name: str) -> bool:
-        """Check if within trading session"""
-        # Minimal session implementation
-        current_hour = datetime.utcnow().hour
-        
-        sessions = {
-            'london': (7, 16),
-            'new_york': (13, 22),
-            'asia': (0, 9)
-        }
+        lookback = int(params.get('lookback', 20))
         
-        if session_name not in sessions:
-            return True
-            
-        start, end = sessions[session_name]
-        return start <= current_hour < end
+        def check(data: MarketSnapshot) -> bool:
+            ohlc = data.ohlc
+            if ohlc is None:
+                return False
+            return bool(liquidity_sweep(ohlc['high'], ohlc['low'], ohlc['close'], lookback))
+        return check
+
+    def _order_block_rule(self, params: Dict) -> RuleFn:
+        """Build order block mitigation check"""
+        lookback = int(params.get('lookback', 20))
+        
+        def check(data: MarketSnapshot) -> bool:
+            ohlc = data.ohlc
+            if ohlc is None:
+                return False
+            return bool(order_block(ohlc['open'], ohlc['high'], ohlc['low'], ohlc['close'], lookback))
+        return check
+
+    def _current_hour(self) -> int:
+        """Current UTC hour, re-read from the clock only once the hour rolls over"""
+        now = time.time()
+        expires, hour = self._hour_cache
+        if now >= expires:
+            hour = int(now // 3600) % 24
+            self._hour_cache = (now - now % 3600 + 3600, hour)
+        return hour
 
-    def _generate_signal(self, strategy: Dict, market_data: Dict) -> Dict:
+    def _generate_signal(self, strategy: Dict, market_data: MarketSnapshot) -> Dict:
         """Construct the signal object"""
-        symbol = market_data.get('symbol', 'UNKNOWN')
-        price = market_data.get('close', 0.0)
+        symbol = market_data.symbol
+        price = market_data.close if market_data.close is not None else 0.0
         
         # Risk Management
         risk_config = strategy.get('config', {}).get('risk_management', {})
@@ -169,5 +318,14 @@ class StrategyExecutor:
             "created_at": datetime.utcnow().isoformat()
         }
 
+# Rule factories keyed by (type, condition); each returns a RuleFn with parameters bound
+_RULE_FACTORIES: Dict[Tuple[str, str], Callable[[StrategyExecutor, Dict], RuleFn]] = {
+    ('price_action', 'liquidity_sweep'): lambda ex, params: ex._liquidity_sweep_rule(params),
+    ('price_action', 'order_block'): lambda ex, params: ex._order_block_rule(params),
+    ('technical', 'rsi_oversold'): lambda ex, params: ex._rsi_rule(params, 'oversold'),
+    ('technical', 'rsi_overbought'): lambda ex, params: ex._rsi_rule(params, 'overbought'),
+    ('technical', 'above_ema'): lambda ex, params: ex._above_ema_rule(params),
+}
+
 # Global instance
 strategy_executor = StrategyExecutor()
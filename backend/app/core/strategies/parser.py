@@ -3,13 +3,52 @@ JSON Strategy Parser
 Parses user-uploaded strategies in JSON format
 """
 
-import json
+import ast
+import hashlib
 import logging
-from typing import Dict, List, Optional
+from typing import Dict, List, Optional, Union
 from datetime import datetime
 
+import orjson
+
 logger = logging.getLogger(__name__)
 
+# Modules and builtins user Python strategies may not touch
+FORBIDDEN_MODULES = frozenset({'os', 'sys', 'subprocess'})
+FORBIDDEN_CALLS = frozenset({'eval', 'exec', '__import__'})
+
+# Source hash -> security error (None if clean), FIFO-evicted
+_SECURITY_CACHE: Dict[bytes, Optional[str]] = {}
+_SECURITY_CACHE_SIZE = 1024
+
+
+def _check_python_security(python_code: str) -> Optional[str]:
+    """
+    Walk the AST once for forbidden imports and calls
+    
+    Returns:
+        Error message, or None if the code is allowed
+    """
+    try:
+        tree = ast.parse(python_code)
+    except SyntaxError as e:
+        return f"Syntax error: {e}"
+    
+    for node in ast.walk(tree):
+        if isinstance(node, ast.Import):
+            for alias in node.names:
+                module = alias.name.split('.')[0]
+                if module in FORBIDDEN_MODULES:
+                    return f"Security violation: '{module}' is forbidden"
+        elif isinstance(node, ast.ImportFrom):
+            module = (node.module or '').split('.')[0]
+            if module in FORBIDDEN_MODULES:
+                return f"Security violation: '{module}' is forbidden"
+        elif isinstance(node, ast.Call) and isinstance(node.func, ast.Name):
+            if node.func.id in FORBIDDEN_CALLS:
+                return f"Security violation: '{node.func.id}' is forbidden"
+    return None
+
 
 class StrategyParser:
     """
@@ -17,10 +56,12 @@ class StrategyParser:
     Supports JSON format with rule-based logic
     """
     
-    def parse_json_strategy(self, strategy_json: str) -> Dict:
+    def parse_json_strategy(self, strategy_json: Union[str, bytes, Dict]) -> Dict:
         """
         Parse JSON strategy definition
         
+        Accepts a JSON string or bytes, or an already-decoded dict
+        
         Example JSON format:
         {
             "name": "Liquidity Sweep Strategy",
@@ -52,7 +93,10 @@ class StrategyParser:
         }
         """
         try:
-            strategy = json.loads(strategy_json)
+            if isinstance(strategy_json, dict):
+                strategy = strategy_json
+            else:
+                strategy = orjson.loads(strategy_json)
             
             # Validate required fields
             required_fields = ['name', 'rules']
@@ -63,19 +107,36 @@ class StrategyParser:
             # Validate rules
             if not isinstance(strategy['rules'], list) or len(strategy['rules']) == 0:
                 raise ValueError("Strategy must have at least one rule")
-            
+            if not all(isinstance(rule, dict) for rule in strategy['rules']):
+                raise ValueError("Each rule must be an object")
+
             logger.info(f"✅ Parsed strategy: {strategy['name']} with {len(strategy['rules'])} rules")
             
-            return {
+            # Canonical form is stored alongside the raw config so executors
+            # and backtests can use it without re-validating
+            canonical = {
                 'name': strategy['name'],
-                'rules': strategy['rules'],
+                'rules': [
+                    {
+                        'type': rule.get('type'),
+                        'condition': rule.get('condition'),
+                        'parameters': rule.get('parameters', {})
+                    }
+                    for rule in strategy['rules']
+                ],
                 'entry': strategy.get('entry', {}),
-                'risk_management': strategy.get('risk_management', {}),
+                'symbols': strategy.get('symbols', []),
+                'risk_management': strategy.get('risk_management', {})
+            }
+            
+            return {
+                **canonical,
+                'canonical': canonical,
                 'parsed_at': datetime.utcnow().isoformat(),
                 'valid': True
             }
             
-        except json.JSONDecodeError as e:
+        except orjson.JSONDecodeError as e:
             logger.error(f"Invalid JSON: {e}")
             return {'valid': False, 'error': f"Invalid JSON: {str(e)}"}
         except ValueError as e:
@@ -114,11 +175,17 @@ class StrategyParser:
         if not python_code or len(python_code.strip()) == 0:
             return {'valid': False, 'error': "Empty Python Code"}
             
-        # Security check: forbid dangerous imports
-        forbidden = ['os', 'sys', 'subprocess', 'eval', 'exec']
-        for term in forbidden:
-            if f"import {term}" in python_code or f"from {term}" in python_code:
-                return {'valid': False, 'error': f"Security violation: '{term}' is forbidden"}
+        # Security check: forbid dangerous imports and dynamic code execution
+        key = hashlib.blake2b(python_code.encode(), digest_size=16).digest()
+        if key in _SECURITY_CACHE:
+            error = _SECURITY_CACHE[key]
+        else:
+            error = _check_python_security(python_code)
+            if len(_SECURITY_CACHE) >= _SECURITY_CACHE_SIZE:
+                del _SECURITY_CACHE[next(iter(_SECURITY_CACHE))]
+            _SECURITY_CACHE[key] = error
+        if error:
+            return {'valid': False, 'error': error}
 
         # Check for required class/function
         if "class Strategy" not in python_code:
@@ -5,17 +5,41 @@ Monitors market data and triggers strategies when conditions are met
 
 import asyncio
 import logging
-from typing import Dict, List
-from datetime import datetime
+import time
+from typing import Dict, FrozenSet, List, Optional, Tuple
+from datetime import date, datetime
+
+import numpy as np
 
 from app.core.market_data.websocket_client import market_data_engine
 from app.database import supabase_client
-from app.core.strategies.executor import strategy_executor
+from app.core.strategies.executor import (
+    ALL_HOURS,
+    RSI_DEFAULTS,
+    SESSION_MASKS,
+    MarketSnapshot,
+    strategy_executor,
+)
 from app.core.distribution.websocket_distributor import signal_distributor
 # from app.core.distribution.telegram_bot import telegram_bot # Pending implementation
 
 logger = logging.getLogger(__name__)
 
+# Bars of history handed to price action rules
+OHLC_WINDOW = 200
+
+# Seconds a detected regime is reused for the same symbol and day
+REGIME_TTL = 60
+
+# Scorer inputs not yet fed by the probability engine or backtests
+SCORE_PLACEHOLDERS = {
+    'probability_score': 75.0,
+    'backtest_metrics': {'win_rate': 65.0, 'sharpe_ratio': 1.5},
+    'strategy_regime_performance': {'trending': 70.0, 'ranging': 40.0},
+    'risk_reward_ratio': 2.5,
+    'optimal_volatility': 'normal',
+}
+
 class StrategyTriggerSystem:
     """
     Monitors market data and automatically triggers strategies
@@ -27,19 +51,137 @@ class StrategyTriggerSystem:
         self.running = False
         self.signals_generated = 0
         
+        # Per-strategy prefilter arrays, index-aligned with active_strategies
+        self._session_masks = np.zeros(0, dtype=np.int64)
+        self._rsi_below = np.zeros(0)
+        self._rsi_above = np.zeros(0)
+        self._needs_rsi = np.zeros(0, dtype=np.bool_)
+        self._min_bars = np.zeros(0, dtype=np.int64)
+        self._active = np.zeros(0, dtype=np.bool_)
+        # Symbol whitelist per strategy (None = any symbol) and the per-symbol masks built from them
+        self._symbol_whitelists: List[Optional[FrozenSet[str]]] = []
+        self._symbol_masks: Dict[str, np.ndarray] = {}
+        
+        # (symbol, UTC day) -> (regime, monotonic time detected); cleared when the day rolls over
+        self._regime_cache: Dict[Tuple[str, date], Tuple[Dict, float]] = {}
+        self._regime_day = None
+        
+        # Signal score per (regime, volatility): every other scorer input is fixed
+        self._score_cache: Dict[Tuple[str, str], float] = {}
+        
+        # Second-granularity clock shared by every signal, ticked by clock_task
+        self._now_ts = 0
+        self._now_iso = ''
+        self.clock_task = None
+        
     def add_strategy(self, strategy: Dict):
         """
         Add strategy to monitoring system
         Args:
             strategy: Parsed strategy configuration
         """
-        # Validate minimal requirements
-        if strategy.get('name') and strategy.get('rules'):
+        # Use the canonical config validated at create time, no re-parsing
+        parsed_config = strategy.get('parsed_config')
+        if parsed_config:
+            strategy = {**strategy, 'config': parsed_config}
+        
+        # Validate minimal requirements: the executor reads its rules from config
+        if strategy.get('name') and (strategy.get('config') or {}).get('rules'):
+            # Signal fields that never change between candles
+            strategy = {
+                **strategy,
+                '_signal_template': {
+                    'strategy_id': strategy.get('id', 'unknown'),
+                    'strategy_name': strategy['name'],
+                    'probability_score': SCORE_PLACEHOLDERS['probability_score'],
+                    'risk_rating': 'Medium', # Could be derived from volatility
+                    'position_sizing': 2.0, # Default to 2%
+                    'status': 'active'
+                },
+                '_explain_fmt': f"Strategy {strategy['name']} triggered. Regime: {{regime}}. Score: {{score}}/10."
+            }
             self.active_strategies.append(strategy)
+            self._compile_strategies()
             logger.info(f"✅ Strategy added to monitor: {strategy['name']}")
         else:
             logger.error(f"❌ Cannot add invalid strategy: {strategy.get('name', 'Unknown')}")
     
+    def _compile_strategies(self):
+        """
+        Pack each strategy's cheap checks into arrays: active flag, symbol
+        whitelist, session hours, RSI bounds and bars needed by price action
+        
+        These are necessary conditions only: a strategy that passes the
+        prefilter still runs through the full executor.
+        """
+        n = len(self.active_strategies)
+        session_masks = np.full(n, ALL_HOURS, dtype=np.int64)
+        rsi_below = np.full(n, np.inf)
+        rsi_above = np.full(n, -np.inf)
+        needs_rsi = np.zeros(n, dtype=np.bool_)
+        min_bars = np.zeros(n, dtype=np.int64)
+        active = np.ones(n, dtype=np.bool_)
+        whitelists = []
+        
+        for i, strategy in enumerate(self.active_strategies):
+            config = strategy.get('config', {})
+            active[i] = strategy.get('is_active', True)
+            symbols = config.get('symbols') or strategy.get('symbols')
+            whitelists.append(frozenset(symbol.upper() for symbol in symbols) if symbols else None)
+            
+            for rule in config.get('rules', []):
+                rule_type = rule.get('type')
+                condition = rule.get('condition')
+                params = rule.get('parameters', {})
+                
+                if rule_type == 'session':
+                    session_masks[i] &= SESSION_MASKS.get(condition, ALL_HOURS)
+                elif rule_type == 'technical' and condition == 'rsi_oversold':
+                    rsi_below[i] = min(rsi_below[i], params.get('threshold', RSI_DEFAULTS['oversold']))
+                    needs_rsi[i] = True
+                elif rule_type == 'technical' and condition == 'rsi_overbought':
+                    rsi_above[i] = max(rsi_above[i], params.get('threshold', RSI_DEFAULTS['overbought']))
+                    needs_rsi[i] = True
+                elif rule_type == 'price_action':
+                    # Pattern kernels need the lookback window plus the current bar
+                    min_bars[i] = max(min_bars[i], int(params.get('lookback', 20)) + 1)
+        
+        self._session_masks = session_masks
+        self._rsi_below = rsi_below
+        self._rsi_above = rsi_above
+        self._needs_rsi = needs_rsi
+        self._min_bars = min_bars
+        self._active = active
+        self._symbol_whitelists = whitelists
+        self._symbol_masks = {}
+    
+    def _symbol_mask(self, symbol: str) -> np.ndarray:
+        """Strategies allowed to trade a symbol, built once per symbol"""
+        mask = self._symbol_masks.get(symbol)
+        if mask is None:
+            mask = np.fromiter(
+                (whitelist is None or symbol in whitelist for whitelist in self._symbol_whitelists),
+                dtype=np.bool_,
+                count=len(self._symbol_whitelists)
+            )
+            self._symbol_masks[symbol] = mask
+        return mask
+    
+    def _prefilter(self, snapshot: MarketSnapshot) -> np.ndarray:
+        """Indices of strategies that can still fire on this snapshot, cheapest checks first"""
+        mask = self._active & self._symbol_mask(snapshot.symbol.upper())
+        if not mask.any():
+            return np.flatnonzero(mask)
+        
+        bars = len(snapshot.ohlc['close']) if snapshot.ohlc is not None else 0
+        mask &= self._min_bars <= bars
+        mask &= ((self._session_masks >> datetime.utcnow().hour) & 1).astype(np.bool_)
+        if snapshot.rsi is None:
+            mask &= ~self._needs_rsi
+        else:
+            mask &= (snapshot.rsi < self._rsi_below) & (snapshot.rsi > self._rsi_above)
+        return np.flatnonzero(mask)
+    
     async def start(self, symbols: List[str]):
         """
         Start monitoring market data and triggering strategies
@@ -61,6 +203,9 @@ class StrategyTriggerSystem:
             logger.warning("⚠️ No active strategies found in database.")
         
         self.running = True
+        if not self.clock_task:
+            self._tick()
+            self.clock_task = asyncio.create_task(self._clock_loop())
         
         # Subscribe to market data updates
         market_data_engine.subscribe(self._on_market_data)
@@ -84,11 +229,21 @@ class StrategyTriggerSystem:
         
         # logger.debug(f"🔍 Checking {len(self.active_strategies)} strategies for {candle_data['symbol']}")
         
-        # Check each active strategy
-        for strategy in self.active_strategies:
+        # One snapshot (with recent bars for price action rules) shared by every strategy
+        snapshot = MarketSnapshot.from_market_data(
+            candle_data,
+            ohlc=market_data_engine.get_ohlc(candle_data['symbol'], OHLC_WINDOW)
+        )
+        
+        # Signals triggered by this candle, distributed together
+        pending = []
+        
+        # Check each strategy that survives the vectorized prefilter
+        for index in self._prefilter(snapshot).tolist():
+            strategy = self.active_strategies[index]
             try:
                 # Execute strategy rules using the Executor
-                signal_candidate = strategy_executor.execute(strategy, candle_data)
+                signal_candidate = strategy_executor.execute(strategy, snapshot)
                 
                 if signal_candidate:
                     logger.info(f"🎯 Strategy '{strategy['name']}' triggered on {candle_data['symbol']}!")
@@ -97,12 +252,15 @@ class StrategyTriggerSystem:
                     signal = await self._generate_signal(strategy, signal_candidate, candle_data)
                     
                     if signal:
-                        # Distribute signal
-                        await self._distribute_signal(signal)
-                        self.signals_generated += 1
+                        pending.append(signal)
                         
             except Exception as e:
                 logger.error(f"Error evaluating strategy {strategy.get('name')}: {e}")
+        
+        if pending:
+            await self._distribute_signals(pending)
+            await supabase_client.queue_signals(pending)
+            self.signals_generated += len(pending)
     
     async def _generate_signal(self, strategy: Dict, candidate: Dict, market_data: Dict) -> Dict:
         """
@@ -112,56 +270,40 @@ class StrategyTriggerSystem:
             Complete signal with probability, score, and AI analysis
         """
         try:
-            from app.core.probability.market_regime import market_regime_detector
             from app.core.scoring.signal_scorer import signal_scorer
             from app.core.scoring.filter import signal_filter
-            import pandas as pd
             
-            # 1. Detect Market Regime
-            # Ideally fetch more history, here we might need to rely on what we have or fetch snapshot
-            # For efficiency in this trigger, we'll assume we can get a quick snapshot or use cached data
-            # strict implementation would be:
-            # history = await supabase_client.get_market_data(candidate['symbol'], start, end)
-            # df = pd.DataFrame(history)
-            # regime = market_regime_detector.detect_regime(df)
-            
-            # Placeholder for regime until history fetch is optimized for real-time
-            regime = {'regime': 'trending', 'volatility': 'normal'} 
+            # 1. Detect Market Regime from the cached candle history
+            regime = self._get_regime(candidate['symbol'], market_data)
             
             # 2. Calculate Scores
             # These would ideally come from the Probability Engine and Backtest results
             # We'll use the scorer with some estimated inputs for now
-            probability_score = 75.0 # Placeholder: would be calculated by Bayesian engine
-            
-            signal_score = signal_scorer.calculate_signal_score(
-                probability_score=probability_score,
-                backtest_metrics={'win_rate': 65.0, 'sharpe_ratio': 1.5}, # Placeholder
-                market_regime=regime['regime'],
-                strategy_regime_performance={'trending': 70.0, 'ranging': 40.0}, # Placeholder
-                risk_reward_ratio=2.5, # Calculate from candidate
-                current_volatility=regime['volatility'],
-                optimal_volatility='normal'
-            )
+            score_key = (regime['regime'], regime['volatility'])
+            signal_score = self._score_cache.get(score_key)
+            if signal_score is None:
+                signal_score = signal_scorer.calculate_signal_score(
+                    market_regime=regime['regime'],
+                    current_volatility=regime['volatility'],
+                    **SCORE_PLACEHOLDERS
+                )
+                self._score_cache[score_key] = signal_score
             
-            # 3. Create Signal Object
-            signal = {
-                'id': f"sig_{int(datetime.utcnow().timestamp())}",
-                'strategy_id': strategy.get('id', 'unknown'),
-                'strategy_name': strategy['name'],
+            # 3. Create Signal Object from the strategy's precomputed fields
+            now_ts, now_iso = self._timestamp()
+            signal = strategy['_signal_template'].copy()
+            signal.update({
+                'id': f"sig_{now_ts}",
                 'symbol': candidate['symbol'],
                 'direction': candidate['direction'],
                 'entry_price': candidate['entry_price'],
                 'stop_loss': candidate['stop_loss'],
                 'take_profit': candidate['take_profit'],
-                'probability_score': probability_score,
                 'signal_score': signal_score,
                 'confidence_level': 'High' if signal_score > 8.0 else 'Medium',
-                'risk_rating': 'Medium', # Could be derived from volatility
-                'trade_explanation': f"Strategy {strategy['name']} triggered. Regime: {regime['regime']}. Score: {signal_score}/10.",
-                'position_sizing': 2.0, # Default to 2%
-                'status': 'active',
-                'created_at': datetime.utcnow().isoformat()
-            }
+                'trade_explanation': strategy['_explain_fmt'].format(regime=regime['regime'], score=signal_score),
+                'created_at': now_iso
+            })
             
             # 4. Filter Signal
             if not signal_filter.validate(signal):
@@ -175,17 +317,71 @@ class StrategyTriggerSystem:
             logger.error(f"Error generating signal: {e}")
             return None
     
-    async def _distribute_signal(self, signal: Dict):
+    def _tick(self):
+        """Refresh the cached clock"""
+        now = datetime.utcnow()
+        self._now_ts = int(now.timestamp())
+        self._now_iso = now.replace(microsecond=0).isoformat()
+    
+    async def _clock_loop(self):
+        """Tick the cached clock once a second"""
+        while True:
+            await asyncio.sleep(1)
+            self._tick()
+    
+    def _timestamp(self) -> Tuple[int, str]:
         """
-        Distribute signal via all channels
+        Current (unix seconds, ISO string) for signals
+        
+        Reads the clock directly when clock_task is not running
+        (e.g. scripts and tests that don't go through start()).
+        """
+        if not self.clock_task:
+            self._tick()
+        return self._now_ts, self._now_iso
+    
+    def _get_regime(self, symbol: str, market_data: Dict) -> Dict:
+        """
+        Market regime for a symbol, reused for REGIME_TTL seconds within a UTC day
+        
+        A 'structure_break' flag on the candle forces re-detection.
+        """
+        from app.core.probability.market_regime import market_regime_detector
+        import pandas as pd
+        
+        today = datetime.utcnow().date()
+        if today != self._regime_day:
+            self._regime_cache.clear()
+            self._regime_day = today
+        
+        key = (symbol, today)
+        now = time.monotonic()
+        entry = self._regime_cache.get(key)
+        if entry is not None and now - entry[1] < REGIME_TTL and not market_data.get('structure_break'):
+            return entry[0]
+        
+        ohlc = market_data_engine.get_ohlc(symbol, OHLC_WINDOW)
+        if ohlc is None:
+            return {'regime': 'unknown', 'volatility': 'unknown'}
+        
+        # Symbol and bar time key the detector's own per-bar cache
+        regime = market_regime_detector.detect_regime(pd.DataFrame({**ohlc, 'symbol': symbol}))
+        # Short histories fill in over time, so only settled results are reused
+        if regime['regime'] not in ('unknown', 'error'):
+            self._regime_cache[key] = (regime, now)
+        return regime
+    
+    async def _distribute_signals(self, signals: List[Dict]):
+        """
+        Distribute the signals from one candle via all channels
         
         Args:
-            signal: Complete signal to distribute
+            signals: Complete signals to distribute
         """
-        logger.info(f"📡 Distributing signal: {signal['symbol']} {signal['direction']}")
+        logger.info(f"📡 Distributing {len(signals)} signal(s) for {signals[0]['symbol']}")
         
-        # WebSocket distribution
-        await signal_distributor.broadcast_signal(signal)
+        # WebSocket distribution: one message per client for the whole batch
+        await signal_distributor.broadcast_signals(signals)
         
         # Telegram distribution
         # await telegram_bot.send_signal(signal)
@@ -195,6 +391,13 @@ class StrategyTriggerSystem:
     async def stop(self):
         """Stop the trigger system"""
         self.running = False
+        if self.clock_task:
+            self.clock_task.cancel()
+            try:
+                await self.clock_task
+            except asyncio.CancelledError:
+                pass
+            self.clock_task = None
         logger.info(f"🛑 Strategy Trigger System stopped. Signals generated: {self.signals_generated}")
 
 
@@ -221,8 +424,10 @@ async def example_live_system():
     }
     """
     
+    from app.core.strategies.parser import strategy_parser
+    
     parsed_strategy = strategy_parser.parse_json_strategy(strategy_json)
-    strategy_trigger_system.add_strategy(parsed_strategy)
+    strategy_trigger_system.add_strategy({**parsed_strategy, 'parsed_config': parsed_strategy['canonical']})
     
     # Start monitoring
     await strategy_trigger_system.start(['EURUSD', 'GBPUSD', 'BTCUSDT'])
@@ -230,4 +435,9 @@ async def example_live_system():
 
 if __name__ == "__main__":
     logging.basicConfig(level=logging.INFO)
+    try:
+        import uvloop
+        uvloop.install()
+    except ImportError:
+        pass
     asyncio.run(example_live_system())
@@ -0,0 +1,42 @@
+"""
+JIT Warmup
+Compiles (or loads from the on-disk cache) every Numba kernel before traffic arrives
+"""
+
+import logging
+
+import numpy as np
+
+from app.core.backtesting.engine import _metrics_kernel
+from app.core.backtesting.vectorbt_adapter import _pandas_backtest_loop, _sma_crossover
+from app.core.probability.monte_carlo import _mc_kernel, _mc_profit_kernel
+from app.core.strategies._patterns import liquidity_sweep, order_block
+from app.utils.jit import HAS_NUMBA
+
+logger = logging.getLogger(__name__)
+
+
+def warmup():
+    """
+    Call each kernel once with dummy arguments of the production dtypes
+    
+    Runs on the calling thread: parallel kernels must not be first entered
+    from a worker thread, or the threading layer can hang at interpreter exit.
+    """
+    if not HAS_NUMBA:
+        return
+    
+    _metrics_kernel(np.zeros(2))
+    
+    close = np.ones(2, dtype=np.float32)
+    _pandas_backtest_loop(close, np.zeros(2, dtype=np.bool_), np.zeros(2, dtype=np.bool_), 1.0)
+    _sma_crossover(close, 1, 2)
+    
+    _mc_kernel(1, 1, 0.5, 1.01, 0.99, 1.0)
+    _mc_profit_kernel(1, 1, 0.5, 1.01, 0.99)
+    
+    bars = np.ones(2)
+    liquidity_sweep(bars, bars, bars, 1)
+    order_block(bars, bars, bars, bars, 1)
+    
+    logger.info("✅ JIT kernels warmed up")
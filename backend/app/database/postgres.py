@@ -16,6 +16,9 @@ engine = create_async_engine(
     pool_pre_ping=True,
     pool_size=20,
     max_overflow=40,
+    # Compiled-SQL cache (default 500) and asyncpg's per-connection prepared statements (default 100)
+    query_cache_size=1200,
+    connect_args={"prepared_statement_cache_size": 500},
 )
 
 # Create sync engine (for migrations and initial setup)
@@ -3,19 +3,86 @@ Supabase Database Client
 Handles all database operations using Supabase
 """
 
+import asyncio
 import os
 import logging
 from typing import Dict, List, Optional
-from datetime import datetime
+from datetime import datetime, timezone
+import orjson
 from supabase import create_client, Client
 
+try:
+    import asyncpg
+    HAS_ASYNCPG = True
+except ImportError:
+    HAS_ASYNCPG = False
+
 logger = logging.getLogger(__name__)
 
+# Buffered signal inserts: flushed every interval, or early once a batch fills
+SIGNAL_FLUSH_INTERVAL = 0.25  # seconds
+SIGNAL_BATCH_MAX = 100
+
+# Columns written per signal, with the type each is cast to from text
+_SIGNAL_COLUMNS = (
+    ('strategy_id', 'uuid'),
+    ('symbol', 'text'),
+    ('direction', 'text'),
+    ('entry_price', 'numeric'),
+    ('stop_loss', 'numeric'),
+    ('take_profit', 'numeric'),
+    ('probability_score', 'numeric'),
+    ('signal_score', 'numeric'),
+    ('confidence_level', 'text'),
+    ('risk_rating', 'text'),
+    ('trade_explanation', 'text'),
+    ('position_sizing', 'numeric'),
+    ('status', 'text'),
+    ('created_at', 'timestamptz'),
+)
+
+# One unnest over per-column text arrays: a single statement for any batch size
+_INSERT_SIGNALS = (
+    f"INSERT INTO signals ({', '.join(name for name, _ in _SIGNAL_COLUMNS)}) "
+    f"SELECT {', '.join(f'{name}::{pg_type}' for name, pg_type in _SIGNAL_COLUMNS)} "
+    f"FROM unnest({', '.join(f'${i}::text[]' for i in range(1, len(_SIGNAL_COLUMNS) + 1))}) "
+    f"AS t({', '.join(name for name, _ in _SIGNAL_COLUMNS)}) "
+    f"RETURNING id"
+)
+# Range scan served by idx_market_data_symbol_time (migrations/003)
+_SELECT_MARKET_DATA = (
+    "SELECT time, open, high, low, close, volume FROM market_data "
+    "WHERE symbol = $1 AND time BETWEEN $2 AND $3 ORDER BY time"
+)
+_SELECT_SIGNALS = "SELECT * FROM hq_signals($1, $2, $3, $4, $5)"
+_SELECT_ACTIVE_STRATEGIES = "SELECT * FROM strategies WHERE is_active = true"
+
+
+def _as_utc(value: datetime) -> datetime:
+    """Attach UTC to naive datetimes (asyncpg would otherwise assume local time)"""
+    return value.replace(tzinfo=timezone.utc) if value.tzinfo is None else value
+
+
+async def _init_connection(conn):
+    """Decode rows the way PostgREST returns them (plain floats, str ids, parsed JSON)"""
+    await conn.set_type_codec('numeric', encoder=str, decoder=float, schema='pg_catalog')
+    await conn.set_type_codec('uuid', encoder=str, decoder=str, schema='pg_catalog')
+    await conn.set_type_codec(
+        'jsonb',
+        encoder=lambda value: orjson.dumps(value).decode(),
+        decoder=orjson.loads,
+        schema='pg_catalog'
+    )
+
 
 class SupabaseClient:
     """
     Supabase database client for TraderCopilot
     Provides methods for signal storage, retrieval, and analytics
+
+    Hot paths (signal inserts, signal reads, active strategies) go straight
+    to Postgres over an asyncpg pool when DATABASE_URL is set; everything
+    else, and those paths without a pool, use the REST client.
     """
     
     def __init__(self):
@@ -25,6 +92,16 @@ class SupabaseClient:
         self.client: Optional[Client] = None
         self.connected = False
         
+        # Direct Postgres pool for hot paths, created in start()
+        self.database_url = os.getenv('DATABASE_URL')
+        self._pg = None
+        
+        # Signals waiting for the next multi-row insert
+        self._signal_buffer: List[Dict] = []
+        self._flush_now = asyncio.Event()
+        self._stopping = False
+        self.flush_task = None
+        
         if self.url and self.key:
             try:
                 self.client = create_client(self.url, self.key)
@@ -40,20 +117,35 @@ class SupabaseClient:
     async def get_market_data(self, symbol: str, start_date: datetime, end_date: datetime, interval: str = '1m') -> List[Dict]:
         """
         Fetch historical market data for backtesting
+        
+        Over the asyncpg pool each connection prepares the range query once
+        and reuses its plan; naive datetimes are taken as UTC.
         """
+        if self._pg:
+            try:
+                records = await self._pg.fetch(
+                    _SELECT_MARKET_DATA, symbol, _as_utc(start_date), _as_utc(end_date)
+                )
+                return [dict(record) for record in records]
+            except Exception as e:
+                logger.error(f"Error fetching market data: {e}")
+                return []
+        
         if not self.connected:
             return []
             
         try:
             # Query the market_data table
             # Note: TimescaleDB hypertables are queried like normal tables
-            result = self.client.table('market_data')\
-                .select('*')\
-                .eq('symbol', symbol)\
-                .gte('time', start_date.isoformat())\
-                .lte('time', end_date.isoformat())\
-                .order('time', desc=False)\
-                .execute()
+            result = await asyncio.to_thread(
+                self.client.table('market_data')
+                .select('*')
+                .eq('symbol', symbol)
+                .gte('time', start_date.isoformat())
+                .lte('time', end_date.isoformat())
+                .order('time', desc=False)
+                .execute
+            )
                 
             return result.data if result.data else []
             
@@ -62,6 +154,26 @@ class SupabaseClient:
             return []
 
     # SIGNALS
+    @staticmethod
+    def _signal_row(signal: Dict) -> Dict:
+        """Map a signal dict to a signals table row"""
+        return {
+            'strategy_id': signal.get('strategy_id'),
+            'symbol': signal['symbol'],
+            'direction': signal['direction'],
+            'entry_price': float(signal['entry_price']),
+            'stop_loss': float(signal['stop_loss']),
+            'take_profit': float(signal['take_profit']),
+            'probability_score': float(signal['probability_score']),
+            'signal_score': float(signal['signal_score']),
+            'confidence_level': signal['confidence_level'],
+            'risk_rating': signal['risk_rating'],
+            'trade_explanation': signal['trade_explanation'],
+            'position_sizing': float(signal['position_sizing']),
+            'status': signal.get('status', 'active'),
+            'created_at': signal.get('created_at', datetime.utcnow().isoformat())
+        }
+    
     async def store_signal(self, signal: Dict) -> Optional[str]:
         """
         Store signal in database
@@ -72,27 +184,16 @@ class SupabaseClient:
         Returns:
             Signal ID if successful
         """
+        if self._pg:
+            ids = await self.store_signals([signal])
+            return ids[0] if ids else None
+        
         if not self.connected:
             logger.warning("Database not connected, signal not stored")
             return None
         
         try:
-            result = self.client.table('signals').insert({
-                'strategy_id': signal.get('strategy_id'),
-                'symbol': signal['symbol'],
-                'direction': signal['direction'],
-                'entry_price': float(signal['entry_price']),
-                'stop_loss': float(signal['stop_loss']),
-                'take_profit': float(signal['take_profit']),
-                'probability_score': float(signal['probability_score']),
-                'signal_score': float(signal['signal_score']),
-                'confidence_level': signal['confidence_level'],
-                'risk_rating': signal['risk_rating'],
-                'trade_explanation': signal['trade_explanation'],
-                'position_sizing': float(signal['position_sizing']),
-                'status': signal.get('status', 'active'),
-                'created_at': signal.get('created_at', datetime.utcnow().isoformat())
-            }).execute()
+            result = await asyncio.to_thread(self.client.table('signals').insert(self._signal_row(signal)).execute)
             
             logger.info(f"✅ Signal stored in database: {signal['symbol']}")
             return result.data[0]['id'] if result.data else None
@@ -101,28 +202,141 @@ class SupabaseClient:
             logger.error(f"Error storing signal: {e}")
             return None
     
-    async def get_signals(self, symbols: List[str] = None, min_score: float = None, 
-                         min_prob: float = None, status: str = None, limit: int = 50) -> List[Dict]:
-        """Get signals with filtering"""
+    async def store_signals(self, signals: List[Dict]) -> List[str]:
+        """
+        Store several signals with one multi-row insert
+        
+        Returns:
+            IDs of the stored signals
+        """
+        if self._pg:
+            return await self._store_signals_pg(signals)
+        
         if not self.connected:
+            logger.warning("Database not connected, signals not stored")
             return []
         
         try:
-            query = self.client.table('signals').select('*')
+            result = await asyncio.to_thread(
+                self.client.table('signals').insert([self._signal_row(s) for s in signals]).execute
+            )
             
-            if symbols:
-                query = query.in_('symbol', symbols)
+            logger.info(f"✅ {len(signals)} signals stored in database")
+            return [row['id'] for row in result.data] if result.data else []
             
-            if min_score is not None:
-                query = query.gte('signal_score', min_score)
-            
-            if min_prob is not None:
-                query = query.gte('probability_score', min_prob)
+        except Exception as e:
+            logger.error(f"Error storing {len(signals)} signals: {e}")
+            return []
+    
+    async def _store_signals_pg(self, signals: List[Dict]) -> List[str]:
+        """Multi-row insert over the asyncpg pool"""
+        rows = [self._signal_row(s) for s in signals]
+        columns = [
+            [None if row[name] is None else str(row[name]) for row in rows]
+            for name, _ in _SIGNAL_COLUMNS
+        ]
+        
+        try:
+            records = await self._pg.fetch(_INSERT_SIGNALS, *columns)
             
-            if status:
-                query = query.eq('status', status)
+            logger.info(f"✅ {len(signals)} signals stored in database")
+            return [record['id'] for record in records]
             
-            result = query.order('created_at', desc=True).limit(limit).execute()
+        except Exception as e:
+            logger.error(f"Error storing {len(signals)} signals: {e}")
+            return []
+    
+    async def queue_signals(self, signals: List[Dict]):
+        """
+        Buffer signals for the next batched insert
+        
+        Stores them directly when the flusher is not running
+        (e.g. scripts that don't go through app startup).
+        """
+        if not self.flush_task:
+            await self.store_signals(signals)
+            return
+        
+        self._signal_buffer.extend(signals)
+        if len(self._signal_buffer) >= SIGNAL_BATCH_MAX:
+            self._flush_now.set()
+    
+    async def start(self):
+        """Open the Postgres pool and start the background signal flusher"""
+        if HAS_ASYNCPG and self.database_url and not self._pg:
+            try:
+                self._pg = await asyncpg.create_pool(
+                    self.database_url,
+                    min_size=1,
+                    max_size=10,
+                    init=_init_connection
+                )
+                logger.info("✅ Postgres pool ready for signal and strategy queries")
+            except Exception as e:
+                logger.error(f"❌ Postgres pool failed, using REST: {e}")
+        
+        if (self.connected or self._pg) and not self.flush_task:
+            self._stopping = False
+            self.flush_task = asyncio.create_task(self._flush_loop())
+            logger.info("✅ Signal insert buffer started")
+    
+    async def stop(self):
+        """Stop the flusher and store any buffered signals"""
+        if self.flush_task:
+            # Let an in-flight insert finish rather than cancelling it: a
+            # cancelled insert may still commit and would be stored twice
+            self._stopping = True
+            self._flush_now.set()
+            await self.flush_task
+            self.flush_task = None
+        await self._flush_signals()
+        
+        if self._pg:
+            await self._pg.close()
+            self._pg = None
+    
+    async def _flush_loop(self):
+        """Insert buffered signals every SIGNAL_FLUSH_INTERVAL, or as soon as a batch fills"""
+        while not self._stopping:
+            try:
+                await asyncio.wait_for(self._flush_now.wait(), SIGNAL_FLUSH_INTERVAL)
+            except asyncio.TimeoutError:
+                pass
+            self._flush_now.clear()
+            await self._flush_signals()
+    
+    async def _flush_signals(self):
+        """Insert everything currently buffered"""
+        while self._signal_buffer:
+            batch = self._signal_buffer[:SIGNAL_BATCH_MAX]
+            await self.store_signals(batch)
+            # Removed only once the insert has returned; failures are logged by store_signals
+            del self._signal_buffer[:len(batch)]
+    
+    async def get_signals(self, symbols: List[str] = None, min_score: float = None, 
+                         min_prob: float = None, status: str = None, limit: int = 50) -> List[Dict]:
+        """Get signals with filtering (single call to the hq_signals function)"""
+        if self._pg:
+            try:
+                records = await self._pg.fetch(
+                    _SELECT_SIGNALS, symbols or None, min_score, min_prob, status or None, limit
+                )
+                return [dict(record) for record in records]
+            except Exception as e:
+                logger.error(f"Error fetching signals with filters: {e}")
+                return []
+        
+        if not self.connected:
+            return []
+        
+        try:
+            result = await asyncio.to_thread(self.client.rpc('hq_signals', {
+                'symbols': symbols or None,
+                'min_score': min_score,
+                'min_prob': min_prob,
+                'status': status or None,
+                'lim': limit
+            }).execute)
             return result.data if result.data else []
             
         except Exception as e:
@@ -139,11 +353,13 @@ class SupabaseClient:
             return None
         
         try:
-            result = self.client.table('signals')\
-                .select('*')\
-                .eq('id', signal_id)\
-                .single()\
-                .execute()
+            result = await asyncio.to_thread(
+                self.client.table('signals')
+                .select('*')
+                .eq('id', signal_id)
+                .single()
+                .execute
+            )
             
             return result.data
         except Exception as e:
@@ -159,10 +375,12 @@ class SupabaseClient:
             update_data = {'status': status}
             update_data.update(kwargs)
             
-            self.client.table('signals')\
-                .update(update_data)\
-                .eq('id', signal_id)\
-                .execute()
+            await asyncio.to_thread(
+                self.client.table('signals')
+                .update(update_data)
+                .eq('id', signal_id)
+                .execute
+            )
             
             logger.info(f"Signal {signal_id} updated to {status}")
         except Exception as e:
@@ -175,13 +393,14 @@ class SupabaseClient:
             return None
         
         try:
-            result = self.client.table('strategies').insert({
+            result = await asyncio.to_thread(self.client.table('strategies').insert({
                 'name': strategy['name'],
                 'strategy_type': strategy.get('type', 'json'),
                 'config': strategy.get('rules', {}),
                 'risk_management': strategy.get('risk_management', {}),
+                'parsed_config': strategy.get('parsed_config'),
                 'created_at': datetime.utcnow().isoformat()
-            }).execute()
+            }).execute)
             
             return result.data[0]['id'] if result.data else None
         except Exception as e:
@@ -194,25 +413,55 @@ class SupabaseClient:
             return []
         
         try:
-            result = self.client.table('strategies')\
-                .select('*')\
-                .execute()
+            result = await asyncio.to_thread(
+                self.client.table('strategies')
+                .select('*')
+                .execute
+            )
             
             return result.data if result.data else []
         except Exception as e:
             logger.error(f"Error fetching strategies: {e}")
             return []
 
+    async def get_strategy_by_id(self, strategy_id: str) -> Optional[Dict]:
+        """Get specific strategy by ID"""
+        if not self.connected:
+            return None
+        
+        try:
+            result = await asyncio.to_thread(
+                self.client.table('strategies')
+                .select('*')
+                .eq('id', strategy_id)
+                .limit(1)
+                .execute
+            )
+            
+            return result.data[0] if result.data else None
+        except Exception as e:
+            logger.error(f"Error fetching strategy: {e}")
+            return None
+
     async def get_active_strategies(self) -> List[Dict]:
         """Get only active strategies for execution"""
+        if self._pg:
+            try:
+                return [dict(record) for record in await self._pg.fetch(_SELECT_ACTIVE_STRATEGIES)]
+            except Exception as e:
+                logger.error(f"Error fetching active strategies: {e}")
+                return []
+        
         if not self.connected:
             return []
         
         try:
-            result = self.client.table('strategies')\
-                .select('*')\
-                .eq('is_active', True)\
-                .execute()
+            result = await asyncio.to_thread(
+                self.client.table('strategies')
+                .select('*')
+                .eq('is_active', True)
+                .execute
+            )
             
             return result.data if result.data else []
         except Exception as e:
@@ -226,7 +475,7 @@ class SupabaseClient:
             return None
         
         try:
-            data = self.client.table('backtest_results').insert({
+            data = await asyncio.to_thread(self.client.table('backtest_results').insert({
                 'strategy_id': result.get('strategy_id'),
                 'total_trades': result['total_trades'],
                 'winning_trades': result.get('winning_trades', 0),
@@ -237,7 +486,7 @@ class SupabaseClient:
                 'max_drawdown': float(result['max_drawdown']),
                 'total_return': float(result.get('total_return', 0)),
                 'created_at': datetime.utcnow().isoformat()
-            }).execute()
+            }).execute)
             
             return data.data[0]['id'] if data.data else None
         except Exception as e:
@@ -2,7 +2,7 @@
 
 from fastapi import FastAPI, Request
 from fastapi.middleware.cors import CORSMiddleware
-from fastapi.responses import JSONResponse
+from fastapi.responses import JSONResponse, ORJSONResponse
 from contextlib import asynccontextmanager
 import logging
 import sys
@@ -13,7 +13,12 @@ from app.config import settings
 from app.api.v1.api import api_router
 from app.core.triggers.strategy_trigger import strategy_trigger_system
 from app.core.distribution.websocket_distributor import websocket_distributor
+from app.core.distribution.telegram_bot import telegram_bot
+from app.core.distribution.webhook import webhook_manager
+from app.core.intelligence.embedding_batcher import embedding_batcher
+from app.core.backtesting.worker_pool import backtest_pool
 from app.database import supabase_client
+from app.core.warmup import warmup
 
 # Configure logging
 logging.basicConfig(
@@ -36,6 +41,9 @@ async def lifespan(app: FastAPI):
     logger.info(f"Environment: {settings.ENVIRONMENT}")
     
     try:
+        # Pay JIT compile cost at startup rather than on the first backtest
+        warmup()
+        
         # Check database connection
         if supabase_client.connected:
             logger.info("✅ Database connection verified")
@@ -46,6 +54,20 @@ async def lifespan(app: FastAPI):
         await websocket_distributor.start()
         logger.info("✅ WebSocket Distributor started")
         
+        # Start Embedding Batcher for knowledge ingestion
+        await embedding_batcher.start()
+        
+        # Start process pool for CPU-bound backtests
+        backtest_pool.start()
+        
+        # Start batched signal inserts to Supabase
+        await supabase_client.start()
+        
+        # Start batched signal inserts (pipeline needs the Postgres engine)
+        if settings.DATABASE_URL:
+            from app.core.signals.pipeline import signal_pipeline
+            await signal_pipeline.start()
+        
         # Start Strategy Trigger System (in background)
         # We start it with some default symbols but it can be updated dynamically
         asyncio.create_task(strategy_trigger_system.start(["BTCUSDT", "ETHUSDT", "EURUSD"]))
@@ -62,7 +84,15 @@ async def lifespan(app: FastAPI):
         # Shutdown
         logger.info("Shutting down application...")
         await websocket_distributor.stop()
+        await embedding_batcher.stop()
+        backtest_pool.stop()
+        if settings.DATABASE_URL:
+            from app.core.signals.pipeline import signal_pipeline
+            await signal_pipeline.stop()
+        await telegram_bot.close()
+        await webhook_manager.close()
         await strategy_trigger_system.stop()
+        await supabase_client.stop()
         logger.info("Shutdown complete")
 
 
@@ -72,6 +102,7 @@ app = FastAPI(
     version=settings.VERSION,
     description="Institutional-grade quantitative trading signal platform",
     lifespan=lifespan,
+    default_response_class=ORJSONResponse,
     docs_url="/docs" if settings.DEBUG else None,
     redoc_url="/redoc" if settings.DEBUG else None,
 )
@@ -3,7 +3,7 @@
 from sqlalchemy import Column, String, Boolean, Integer, Float, DateTime, Text, ForeignKey, Index, DECIMAL
 from sqlalchemy.dialects.postgresql import UUID, JSONB
 from sqlalchemy.orm import relationship
-from sqlalchemy.sql import func
+from sqlalchemy.sql import func, text
 from app.database import Base
 import uuid
 
@@ -50,6 +50,7 @@ class Strategy(Base):
     description = Column(Text)
     strategy_type = Column(String(50), nullable=False)  # 'json', 'pine', 'python'
     config = Column(JSONB, nullable=False)
+    parsed_config = Column(JSONB)  # Canonical form validated at create time
     executable_code = Column(Text)
     is_active = Column(Boolean, default=True)
     created_at = Column(DateTime(timezone=True), server_default=func.now())
@@ -83,6 +84,15 @@ class BacktestResult(Base):
     
     # Relationships
     strategy = relationship("Strategy", back_populates="backtest_results")
+    
+    __table_args__ = (
+        Index(
+            'idx_backtest_results_strategy_latest',
+            strategy_id,
+            created_at.desc(),
+            postgresql_include=['total_trades', 'win_rate', 'sharpe_ratio', 'max_drawdown', 'profit_factor'],
+        ),
+    )
 
 
 class Signal(Base):
@@ -114,6 +124,12 @@ class Signal(Base):
         Index('idx_signals_created_at', 'created_at'),
         Index('idx_signals_status', 'status'),
         Index('idx_signals_symbol', 'symbol'),
+        Index(
+            'idx_signals_active_quality',
+            created_at.desc(),
+            postgresql_include=['signal_score', 'probability_score', 'symbol'],
+            postgresql_where=text("status = 'active' AND signal_score >= 5.0"),
+        ),
     )
 
 
@@ -1,6 +1,6 @@
 """Pydantic schemas for request/response validation"""
 
-from pydantic import BaseModel, Field, validator
+from pydantic import BaseModel, ConfigDict, Field, validator
 from typing import Optional, Dict, Any, List
 from datetime import datetime
 from uuid import UUID
@@ -34,8 +34,7 @@ class StrategyResponse(StrategyBase):
     created_at: datetime
     updated_at: Optional[datetime] = None
     
-    class Config:
-        from_attributes = True
+    model_config = ConfigDict(from_attributes=True)
 
 
 # Backtest Schemas
@@ -67,8 +66,7 @@ class BacktestResponse(BaseModel):
     metrics: BacktestMetrics
     created_at: datetime
     
-    class Config:
-        from_attributes = True
+    model_config = ConfigDict(from_attributes=True)
 
 
 # Signal Schemas
@@ -98,8 +96,7 @@ class SignalResponse(SignalBase):
     created_at: datetime
     expires_at: datetime
     
-    class Config:
-        from_attributes = True
+    model_config = ConfigDict(from_attributes=True)
 
 
 class SignalFilter(BaseModel):
@@ -122,8 +119,7 @@ class MarketDataPoint(BaseModel):
     volume: Decimal
     exchange: str
     
-    class Config:
-        from_attributes = True
+    model_config = ConfigDict(from_attributes=True)
 
 
 # Knowledge Base Schemas
@@ -145,8 +141,7 @@ class KnowledgeResponse(BaseModel):
     similarity: Optional[float] = None
     created_at: datetime
     
-    class Config:
-        from_attributes = True
+    model_config = ConfigDict(from_attributes=True)
 
 
 # User Schemas
@@ -160,8 +155,7 @@ class UserResponse(BaseModel):
     subscription_tier: str
     created_at: datetime
     
-    class Config:
-        from_attributes = True
+    model_config = ConfigDict(from_attributes=True)
 
 
 # Health Check Schema
@@ -0,0 +1,41 @@
+"""
+Optional Numba JIT support
+Falls back to plain Python functions when numba is not installed
+"""
+
+import logging
+import os
+
+logger = logging.getLogger(__name__)
+
+# Persistent on-disk cache for @njit(cache=True) kernels. Must be set before
+# numba is imported; mount it as a volume so compiles survive restarts.
+DEFAULT_NUMBA_CACHE_DIR = "/var/cache/tradecopilot/numba"
+
+if "NUMBA_CACHE_DIR" not in os.environ:
+    try:
+        os.makedirs(DEFAULT_NUMBA_CACHE_DIR, exist_ok=True)
+        os.environ["NUMBA_CACHE_DIR"] = DEFAULT_NUMBA_CACHE_DIR
+    except OSError:
+        # Not writable (e.g. local dev) - numba caches next to the sources
+        pass
+
+# Try importing numba, fallback to a no-op decorator if not available
+try:
+    from numba import njit, prange
+    HAS_NUMBA = True
+except ImportError:
+    HAS_NUMBA = False
+    logger.debug("numba not installed, JIT kernels will run as plain Python")
+
+    prange = range
+
+    def njit(*args, **kwargs):
+        """No-op stand-in for numba.njit supporting both decorator forms"""
+        if len(args) == 1 and callable(args[0]) and not kwargs:
+            return args[0]
+
+        def decorator(func):
+            return func
+
+        return decorator
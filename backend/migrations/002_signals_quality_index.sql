@@ -0,0 +1,10 @@
+-- Partial index for active signal feeds
+-- Serves: WHERE status = 'active' AND signal_score >= $1 AND probability_score >= $2
+--         ORDER BY created_at DESC LIMIT $3
+-- Rows come out of the index already ordered, so the score filters only
+-- have to be checked until LIMIT is satisfied instead of scanning the table.
+-- Low-score signals never pass the platform thresholds, so they are left out.
+CREATE INDEX CONCURRENTLY IF NOT EXISTS idx_signals_active_quality
+    ON signals (created_at DESC)
+    INCLUDE (signal_score, probability_score, symbol)
+    WHERE status = 'active' AND signal_score >= 5.0;
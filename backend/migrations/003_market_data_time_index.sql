@@ -0,0 +1,35 @@
+-- Market data storage for time-range scans
+-- Serves: WHERE symbol = $1 AND time BETWEEN $2 AND $3 ORDER BY time LIMIT $4
+
+CREATE TABLE IF NOT EXISTS market_data (
+    time TIMESTAMPTZ NOT NULL,
+    symbol VARCHAR(20) NOT NULL,
+    open DECIMAL(20, 8),
+    high DECIMAL(20, 8),
+    low DECIMAL(20, 8),
+    close DECIMAL(20, 8),
+    volume DECIMAL(20, 8),
+    exchange VARCHAR(20),
+    PRIMARY KEY (time, symbol)
+);
+
+CREATE INDEX IF NOT EXISTS idx_market_data_symbol_time ON market_data(symbol, time);
+
+-- With TimescaleDB, partition by time so range queries only touch matching chunks.
+-- Without it, fall back to a BRIN index: candles are appended in time order,
+-- so block ranges stay tightly correlated with time and the index stays tiny.
+DO $$
+BEGIN
+    IF EXISTS (SELECT 1 FROM pg_extension WHERE extname = 'timescaledb') THEN
+        PERFORM create_hypertable(
+            'market_data', 'time',
+            chunk_time_interval => INTERVAL '1 day',
+            if_not_exists => TRUE,
+            migrate_data => TRUE
+        );
+    ELSE
+        CREATE INDEX IF NOT EXISTS idx_market_data_time_brin
+            ON market_data USING BRIN (time) WITH (pages_per_range = 32);
+    END IF;
+END
+$$;
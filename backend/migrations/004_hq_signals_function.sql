@@ -0,0 +1,23 @@
+-- Signal feed query as a single stored function
+-- Called via supabase.rpc('hq_signals', {...}); NULL arguments disable that filter.
+-- Parameters are qualified with the function name because they share names
+-- with signals columns (columns win in unqualified SQL function bodies).
+CREATE OR REPLACE FUNCTION hq_signals(
+    symbols TEXT[] DEFAULT NULL,
+    min_score FLOAT DEFAULT NULL,
+    min_prob FLOAT DEFAULT NULL,
+    status TEXT DEFAULT NULL,
+    lim INT DEFAULT 50
+)
+RETURNS SETOF signals
+LANGUAGE SQL STABLE
+AS $$
+    SELECT *
+    FROM signals s
+    WHERE (hq_signals.symbols IS NULL OR s.symbol = ANY(hq_signals.symbols))
+      AND (hq_signals.min_score IS NULL OR s.signal_score >= hq_signals.min_score)
+      AND (hq_signals.min_prob IS NULL OR s.probability_score >= hq_signals.min_prob)
+      AND (hq_signals.status IS NULL OR s.status = hq_signals.status)
+    ORDER BY s.created_at DESC
+    LIMIT hq_signals.lim;
+$$;
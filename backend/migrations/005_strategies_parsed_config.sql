@@ -0,0 +1,3 @@
+-- Canonical strategy config, validated once when the strategy is created
+-- Executors and backtests read this instead of re-parsing the raw rules.
+ALTER TABLE strategies ADD COLUMN IF NOT EXISTS parsed_config JSONB;
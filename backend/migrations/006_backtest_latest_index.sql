@@ -0,0 +1,10 @@
+-- Composite index for latest-backtest lookups
+-- Serves: SELECT DISTINCT ON (strategy_id) ... WHERE strategy_id IN (...)
+--         ORDER BY strategy_id, created_at DESC
+-- Each strategy's newest backtest is the first index entry under its id, so
+-- the lookup is one index seek per strategy instead of a scan and sort.
+-- The validation metrics are included so threshold checks can read them
+-- from the index.
+CREATE INDEX CONCURRENTLY IF NOT EXISTS idx_backtest_results_strategy_latest
+    ON backtest_results (strategy_id, created_at DESC)
+    INCLUDE (total_trades, win_rate, sharpe_ratio, max_drawdown, profit_factor);
@@ -0,0 +1,187 @@
+
+import numpy as np
+import pytest
+from app.core.backtesting.engine import backtest_engine
+from app.core.backtesting.vectorbt_adapter import vectorbt_adapter
+
+SIGNALS = [
+    {
+        'entry_price': 1.08520,
+        'stop_loss': 1.08380,
+        'take_profit': 1.08890,
+        'direction': 'BUY'
+    },
+    {
+        'entry_price': 42850.00,
+        'stop_loss': 43150.00,
+        'take_profit': 41950.00,
+        'direction': 'SELL'
+    }
+] * 50
+
+def test_backtest_equity_matches_trade_pnl():
+    """Test vectorized execution compounds PnL into the equity curve"""
+    result = backtest_engine.run_backtest(
+        strategy_name="Test Strategy",
+        signals=SIGNALS,
+        price_data=None,
+        initial_capital=10000.0,
+        seed=42
+    )
+
+    assert result['total_trades'] == 100
+    assert len(result['equity_curve']) == 101
+    assert result['equity_curve'].dtype == np.float32
+
+    # Replay trades sequentially: each risks 10% of running capital
+    capital = 10000.0
+    for trade, equity in zip(result['trades'], result['equity_curve'][1:]):
+        assert trade['pnl'] == pytest.approx(capital * 0.1 * trade['pnl_percent'] / 100)
+        capital += trade['pnl']
+        assert equity == pytest.approx(capital)
+
+    losses = [t for t in result['trades'] if t['outcome'] == 'loss']
+    assert all(t['pnl_percent'] == pytest.approx(-100.0) for t in losses)
+    assert result['winning_trades'] + result['losing_trades'] == 100
+
+def test_backtest_seed_is_reproducible():
+    """Test seeded runs replay the same outcomes"""
+    first = backtest_engine.run_backtest("Test Strategy", SIGNALS, None, seed=7)
+    second = backtest_engine.run_backtest("Test Strategy", SIGNALS, None, seed=7)
+
+    assert np.array_equal(first['equity_curve'], second['equity_curve'])
+    assert first['win_rate'] == second['win_rate']
+
+def test_backtest_skips_invalid_signals():
+    """Test signals with stops on the wrong side are not traded"""
+    signals = SIGNALS[:2] + [
+        {'entry_price': 100.0, 'stop_loss': 101.0, 'take_profit': 105.0, 'direction': 'BUY'}
+    ]
+    result = backtest_engine.run_backtest(
+        strategy_name="Test Strategy",
+        signals=signals,
+        price_data=None
+    )
+
+    assert result['total_trades'] == 2
+    assert [t['direction'] for t in result['trades']] == ['BUY', 'SELL']
+
+def test_metrics_max_drawdown():
+    """Test drawdown is measured from the running equity peak"""
+    equity = np.array([100.0, 120.0, 90.0, 130.0, 117.0])
+    pnl = np.diff(equity)
+
+    metrics = backtest_engine._calculate_metrics(pnl, equity, 100.0)
+
+    assert metrics['max_drawdown'] == pytest.approx(25.0)
+    assert metrics['winning_trades'] == 2
+    assert metrics['losing_trades'] == 2
+    assert metrics['total_return'] == pytest.approx(17.0)
+
+def test_pandas_fallback_round_trips():
+    """Test the fallback compounds round trips and scores wins by entry price"""
+    close = np.array([10.0, 10.0, 12.0, 12.0, 9.0, 6.0, 8.0])
+    entries = np.array([True, False, False, True, False, False, False])
+    exits = np.array([False, False, True, False, False, True, False])
+
+    result = vectorbt_adapter._run_with_pandas(close, entries, exits, 1000.0)
+
+    # 10 -> 12 (+20%), then 12 -> 6 (-50%)
+    assert result['equity_curve'].tolist() == pytest.approx([1000, 1000, 1000, 1200, 1200, 900, 600, 600])
+    assert result['total_trades'] == 2
+    assert result['win_rate'] == pytest.approx(50.0)
+    assert result['total_return'] == pytest.approx(-40.0)
+
+def test_float32_signals_match_float64():
+    """Test single-precision prices produce the same crossovers as float64"""
+    rng = np.random.default_rng(0)
+    close = np.ascontiguousarray(rng.standard_normal(20000).cumsum() + 1000)
+
+    entries64, exits64 = vectorbt_adapter._generate_signals({}, close)
+    entries32, exits32 = vectorbt_adapter._generate_signals({}, close.astype(np.float32))
+
+    assert np.array_equal(entries32, entries64)
+    assert np.array_equal(exits32, exits64)
+
+class _FakeTable:
+    """Minimal supabase-py query builder over in-memory rows"""
+
+    def __init__(self, rows):
+        self.rows = rows
+        self.filters = {}
+        self.payload = None
+        self.changes = None
+
+    def insert(self, payload):
+        self.payload = payload
+        return self
+
+    def update(self, payload):
+        self.changes = payload
+        return self
+
+    def select(self, *args):
+        return self
+
+    def eq(self, column, value):
+        self.filters[column] = value
+        return self
+
+    def __getattr__(self, name):
+        # gte/lte/order/limit: ignored by the fake
+        return lambda *args, **kwargs: self
+
+    def execute(self):
+        import uuid
+        from types import SimpleNamespace
+
+        if self.payload is not None:
+            self.rows.append({'id': str(uuid.uuid4()), **self.payload})
+            return SimpleNamespace(data=[self.rows[-1]])
+        matches = [r for r in self.rows if all(r.get(k) == v for k, v in self.filters.items())]
+        if self.changes is not None:
+            for row in matches:
+                row.update(self.changes)
+        return SimpleNamespace(data=matches)
+
+@pytest.mark.asyncio
+async def test_backtest_uses_stored_canonical_config(monkeypatch, caplog):
+    """Test a created strategy is backtested with the canonical config stored for it"""
+    from datetime import datetime
+    from uuid import UUID, uuid4
+    from app.api.v1.endpoints.backtests import run_backtest_task
+    from app.api.v1.endpoints.strategies import create_strategy
+    from app.core.backtesting.worker_pool import backtest_pool
+    from app.database import supabase_client
+    from app.schemas import BacktestRequest, StrategyCreate
+
+    tables = {}
+    client = type('FakeClient', (), {'table': lambda self, name: _FakeTable(tables.setdefault(name, []))})()
+    monkeypatch.setattr(supabase_client, 'client', client)
+    monkeypatch.setattr(supabase_client, 'connected', True)
+    monkeypatch.setattr(supabase_client, '_pg', None)
+
+    configs = []
+
+    async def fake_run_backtest(strategy_config, price_data, initial_capital):
+        configs.append(strategy_config)
+        return backtest_engine.run_backtest("Test Strategy", SIGNALS, None)
+
+    monkeypatch.setattr(backtest_pool, 'run_backtest', fake_run_backtest)
+
+    rules = [{'type': 'technical', 'condition': 'rsi_oversold', 'parameters': {'threshold': 25}}]
+    created = await create_strategy(StrategyCreate(
+        name='RSI dip', strategy_type='json', config={'name': 'RSI dip', 'rules': rules}
+    ))
+    backtest_id = uuid4()
+    tables['backtest_results'] = [{'id': str(backtest_id), 'metrics': {'status': 'running'}}]
+    await run_backtest_task(backtest_id, UUID(created['id']), BacktestRequest(
+        strategy_id=created['id'],
+        start_date=datetime(2024, 1, 1),
+        end_date=datetime(2024, 1, 1, 1)
+    ))
+
+    assert tables['strategies'][0]['parsed_config']['rules'] == rules
+    assert configs == [tables['strategies'][0]['parsed_config']]
+    assert tables['backtest_results'][0]['metrics']['status'] == 'completed'
+    assert 'Backtest failed' not in caplog.text
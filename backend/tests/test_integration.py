@@ -8,7 +8,7 @@ async def test_signal_pipeline_flow(mocker):
     """Test full signal generation pipeline"""
     
     # Mock database dependencies
-    mocker.patch('app.core.signals.pipeline.SignalPipeline._get_strategy', return_value=mocker.Mock(id='test-strat', name='Test Strategy'))
+    mocker.patch('app.core.signals.pipeline.SignalPipeline._get_strategies', return_value={'test-strat': mocker.Mock(id='test-strat', name='Test Strategy')})
     
     # Mock backtest result
     mock_backtest = mocker.Mock(spec=BacktestResult)
@@ -17,8 +17,9 @@ async def test_signal_pipeline_flow(mocker):
     mock_backtest.total_trades = 100
     mock_backtest.profit_factor = 1.5
     mock_backtest.max_drawdown = 10.0
+    mock_backtest.expectancy = 0.5
     
-    mocker.patch('app.core.signals.pipeline.SignalPipeline._get_latest_backtest', return_value=mock_backtest)
+    mocker.patch('app.core.signals.pipeline.SignalPipeline._get_latest_backtests', return_value={'test-strat': mock_backtest})
     
     # Mock Gemini Client
     mocker.patch('app.core.intelligence.gemini_client.GeminiClient.analyze_signal_context', return_value={
@@ -29,7 +30,7 @@ async def test_signal_pipeline_flow(mocker):
     })
     
     # Mock Database add/commit
-    mocker.patch('app.database.AsyncSessionLocal')
+    mocker.patch('app.core.signals.pipeline.AsyncSessionLocal')
     
     # Execute Pipeline
     result = await signal_pipeline.generate_signal(
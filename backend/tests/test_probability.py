@@ -1,4 +1,5 @@
 
+import numpy as np
 import pytest
 from app.core.probability.bayesian import bayesian_engine
 from app.core.probability.monte_carlo import monte_carlo_engine
@@ -24,6 +25,28 @@ async def test_bayesian_probability_calculation():
     assert posterior > prior
     assert 0 <= posterior <= 100
 
+def test_bayesian_batch_matches_single():
+    """Test the vectorized posterior agrees with the per-signal calculation"""
+    historical = {"trending_success_rate": 0.7, "optimal_volatility": "normal"}
+    cases = [
+        (60.0, {"regime": "trending", "volatility": "normal"}),
+        (45.0, {"regime": "ranging", "volatility": "high"}),
+        (0.0, {}),
+        (100.0, {"regime": "trending", "volatility": "low"}),
+    ]
+
+    expected = [
+        bayesian_engine.calculate_posterior_probability(prior, conditions, historical)
+        for prior, conditions in cases
+    ]
+    posteriors = bayesian_engine.calculate_posterior_batch(
+        np.array([prior for prior, _ in cases]),
+        np.array([bayesian_engine._calculate_likelihood(c, historical, "success") for _, c in cases]),
+        np.array([bayesian_engine._calculate_likelihood(c, historical, "failure") for _, c in cases])
+    )
+
+    assert posteriors.tolist() == pytest.approx(expected)
+
 def test_monte_carlo_simulation():
     """Test Monte Carlo simulation bounds"""
     result = monte_carlo_engine.simulate_strategy_performance(
@@ -38,3 +61,20 @@ def test_monte_carlo_simulation():
     assert "expected_return" in result
     assert "var_95" in result
     assert 0 <= result["probability_of_profit"] <= 1.0
+
+def test_trigger_regime_not_shared_across_symbols(monkeypatch):
+    """Test the trigger's regime lookups are keyed by symbol and bar time, not just the last close"""
+    from app.core.market_data.websocket_client import SymbolRing, market_data_engine
+    from app.core.triggers.strategy_trigger import StrategyTriggerSystem
+
+    rings = {}
+    for symbol, closes in [('BTCUSDT', np.linspace(100.0, 130.0, 60)), ('ETHUSDT', np.full(60, 130.0))]:
+        ring = rings[symbol] = SymbolRing()
+        for i, close in enumerate(closes):
+            ring.push({'timestamp': i * 60_000, 'open': close, 'high': close + 1,
+                       'low': close - 1, 'close': close, 'volume': 1.0})
+    monkeypatch.setattr(market_data_engine, 'rings', rings)
+
+    trigger = StrategyTriggerSystem()
+    assert trigger._get_regime('BTCUSDT', {})['regime'] == 'trending'
+    assert trigger._get_regime('ETHUSDT', {})['regime'] == 'ranging'
@@ -1,4 +1,5 @@
 
+import numpy as np
 import pytest
 from app.core.scoring.signal_scorer import signal_scorer
 
@@ -38,3 +39,34 @@ def test_signal_score_filters_poor_metrics():
     )
     
     assert score < 5.0
+
+def test_batch_scores_match_single_scores():
+    """Test the vectorized scorer agrees with per-signal scoring"""
+    rng = np.random.default_rng(0)
+    n = 500
+    probs = rng.uniform(0, 100, n)
+    win_rates = rng.uniform(0, 100, n)
+    sharpes = rng.uniform(-1, 5, n)
+    regime_rates = rng.uniform(0, 100, n)
+    rrs = rng.uniform(0, 5, n)
+    levels = ["very_low", "low", "normal", "high", "very_high", "unknown"]
+    vols = rng.choice(levels, n)
+    optimal = rng.choice(levels, n)
+
+    scores = signal_scorer.calculate_signal_scores_batch(
+        probs, win_rates, sharpes, regime_rates, rrs, vols, optimal
+    )
+
+    expected = [
+        signal_scorer.calculate_signal_score(
+            probability_score=probs[i],
+            backtest_metrics={"win_rate": win_rates[i], "sharpe_ratio": sharpes[i]},
+            market_regime="trending",
+            strategy_regime_performance={"trending": regime_rates[i]},
+            risk_reward_ratio=rrs[i],
+            current_volatility=vols[i],
+            optimal_volatility=optimal[i]
+        )
+        for i in range(n)
+    ]
+    assert scores.tolist() == pytest.approx(expected)
@@ -0,0 +1,149 @@
+
+import numpy as np
+from app.core.strategies._patterns import liquidity_sweep, order_block
+from app.core.strategies.executor import RESORT_EVERY, MarketSnapshot, strategy_executor
+
+def test_liquidity_sweep_needs_reclaim():
+    """Test a sweep requires taking the prior low and closing back above it"""
+    high = np.array([11.0, 11.0, 11.0, 11.0, 11.0])
+    low = np.array([10.0, 9.5, 9.8, 9.9, 9.0])
+    close = np.array([10.5, 10.2, 10.4, 10.3, 9.7])
+
+    assert liquidity_sweep(high, low, close, 3)
+    # Closed below the swept low
+    assert not liquidity_sweep(high, low, np.array([10.5, 10.2, 10.4, 10.3, 9.2]), 3)
+    # Not enough history
+    assert not liquidity_sweep(high, low, close, 10)
+
+def test_order_block_mitigation():
+    """Test price returning into a displaced bearish bar is an order block"""
+    open_ = np.array([10.0, 10.4, 10.1, 10.6, 11.0])
+    high = np.array([10.5, 10.5, 10.9, 11.2, 11.3])
+    low = np.array([9.9, 10.0, 10.0, 10.5, 10.3])
+    close = np.array([10.4, 10.1, 10.8, 11.1, 11.2])
+
+    assert order_block(open_, high, low, close, 4)
+    # Current bar never trades back into the block
+    assert not order_block(open_, high, np.array([9.9, 10.0, 10.0, 10.5, 10.7]), close, 4)
+
+def test_price_action_rule_without_history():
+    """Test price action rules fail instead of passing when no bars are attached"""
+    strategy = {
+        'id': 'sweep',
+        'config': {'rules': [{'type': 'price_action', 'condition': 'liquidity_sweep'}]}
+    }
+    assert strategy_executor.execute(strategy, {'symbol': 'EURUSD', 'close': 1.1}) is None
+
+def test_snapshot_indicator_rules():
+    """Test RSI and EMA rules read the snapshot built from candle indicators"""
+    strategy = {
+        'id': 'trend-dip',
+        'config': {'rules': [
+            {'type': 'technical', 'condition': 'rsi_oversold', 'parameters': {'threshold': 30}},
+            {'type': 'technical', 'condition': 'above_ema', 'parameters': {'period': 50}}
+        ]}
+    }
+    candle = {'symbol': 'EURUSD', 'close': 1.1, 'indicators': {'rsi': 25.0, 'ema_50': 1.05}}
+    snapshot = MarketSnapshot.from_market_data(candle)
+
+    assert snapshot.ema == {50: 1.05}
+    assert strategy_executor.execute(strategy, snapshot)['entry_price'] == 1.1
+    assert strategy_executor.execute(strategy, {**candle, 'close': 1.0}) is None
+
+    grouped = {'symbol': 'EURUSD', 'close': 1.1, 'indicators': {'rsi': 25.0, 'ema': {20: 1.2, 50: 1.05}}}
+    assert strategy_executor.execute(strategy, grouped) is not None
+
+def test_rejecting_rule_moves_first():
+    """Test rules are re-ordered so the one that rejects runs before the one that passes"""
+    strategy = {
+        'id': 'reorder',
+        'config': {'rules': [
+            {'type': 'technical', 'condition': 'above_ema', 'parameters': {'period': 20}},
+            {'type': 'technical', 'condition': 'rsi_overbought', 'parameters': {'threshold': 70}}
+        ]}
+    }
+    snapshot = MarketSnapshot(symbol='EURUSD', close=1.1, rsi=50.0, ema={20: 1.0})
+    compiled = strategy_executor.compile(strategy)
+    rsi_rule = compiled.rules[1][0]
+
+    for _ in range(RESORT_EVERY):
+        assert strategy_executor.execute(strategy, snapshot) is None
+
+    assert compiled.rules[0][0] is rsi_rule
+
+def test_trigger_prefilter_skips_impossible_strategies():
+    """Test the vectorized prefilter only keeps strategies whose RSI rules can pass"""
+    from app.core.triggers.strategy_trigger import StrategyTriggerSystem
+
+    trigger = StrategyTriggerSystem()
+    for name, condition in [('dip', 'rsi_oversold'), ('spike', 'rsi_overbought'), ('any', 'above_ema')]:
+        trigger.add_strategy({
+            'name': name,
+            'rules': [{'type': 'technical', 'condition': condition}],
+            'config': {'rules': [{'type': 'technical', 'condition': condition}]}
+        })
+
+    assert trigger._prefilter(MarketSnapshot(symbol='EURUSD', close=1.1, rsi=25.0)).tolist() == [0, 2]
+    assert trigger._prefilter(MarketSnapshot(symbol='EURUSD', close=1.1, rsi=75.0)).tolist() == [1, 2]
+    assert trigger._prefilter(MarketSnapshot(symbol='EURUSD', close=1.1)).tolist() == [2]
+
+def test_trigger_prefilter_drops_ineligible_strategies():
+    """Test whitelisted symbols, inactive strategies and short histories are dropped early"""
+    from app.core.triggers.strategy_trigger import StrategyTriggerSystem
+
+    trigger = StrategyTriggerSystem()
+    sweep = {'type': 'price_action', 'condition': 'liquidity_sweep', 'parameters': {'lookback': 5}}
+    for name, config, active in [
+        ('btc-only', {'rules': [sweep], 'symbols': ['btcusdt']}, True),
+        ('paused', {'rules': [sweep]}, False),
+        ('any', {'rules': [sweep]}, True),
+    ]:
+        trigger.add_strategy({'name': name, 'rules': config['rules'], 'config': config, 'is_active': active})
+
+    bars = {'close': np.ones(6)}
+    assert trigger._prefilter(MarketSnapshot(symbol='BTCUSDT', close=1.0, ohlc=bars)).tolist() == [0, 2]
+    assert trigger._prefilter(MarketSnapshot(symbol='ETHUSDT', close=1.0, ohlc=bars)).tolist() == [2]
+    assert trigger._prefilter(MarketSnapshot(symbol='BTCUSDT', close=1.0, ohlc={'close': np.ones(5)})).tolist() == []
+
+def test_parser_rejects_non_object_rules():
+    """Test malformed rules are reported as invalid instead of raising"""
+    from app.core.strategies.parser import strategy_parser
+
+    result = strategy_parser.parse_json_strategy({'name': 'x', 'rules': ['rsi']})
+
+    assert result['valid'] is False
+    assert 'rule' in result['error']
+
+def test_trigger_accepts_stored_strategy_rows():
+    """Test rows loaded from the strategies table are monitored with their canonical config"""
+    from app.core.triggers.strategy_trigger import StrategyTriggerSystem
+
+    trigger = StrategyTriggerSystem()
+    rules = [{'type': 'technical', 'condition': 'rsi_oversold', 'parameters': {'threshold': 30}}]
+    trigger.add_strategy({
+        'id': 's1',
+        'name': 'stored',
+        'config': {'name': 'stored', 'rules': [{'type': 'technical', 'condition': 'rsi_oversold'}]},
+        'parsed_config': {'name': 'stored', 'rules': rules},
+        'is_active': True
+    })
+    trigger.add_strategy({'id': 's2', 'name': 'empty', 'config': {'rules': []}})
+
+    assert [s['name'] for s in trigger.active_strategies] == ['stored']
+    assert trigger.active_strategies[0]['config']['rules'] == rules
+
+def test_trigger_whitelist_survives_canonical_config():
+    """Test a symbol whitelist in the raw config still applies after parsing"""
+    from app.core.strategies.parser import strategy_parser
+    from app.core.triggers.strategy_trigger import StrategyTriggerSystem
+
+    parsed = strategy_parser.parse_json_strategy({
+        'name': 'btc-only',
+        'symbols': ['BTCUSDT'],
+        'rules': [{'type': 'technical', 'condition': 'above_ema'}]
+    })
+    trigger = StrategyTriggerSystem()
+    trigger.add_strategy({'name': 'btc-only', 'config': parsed, 'parsed_config': parsed['canonical']})
+
+    assert trigger._prefilter(MarketSnapshot(symbol='BTCUSDT', close=1.0)).tolist() == [0]
+    assert trigger._prefilter(MarketSnapshot(symbol='ETHUSDT', close=1.0)).tolist() == []